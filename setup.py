@@ -10,6 +10,15 @@ with open("README.md", "r", encoding="utf-8") as fh:
 with open("requirements.txt", "r", encoding="utf-8") as fh:
     requirements = [line.strip() for line in fh if line.strip() and not line.startswith("#")]
 
+# Ahead-of-time build of the live analysis kernels; skipped when numba is
+# not available at build time, in which case they are JIT-compiled on use
+ext_modules = []
+try:
+    from voice_viewer._kernels_aot import cc
+    ext_modules.append(cc.distutils_extension())
+except ImportError:
+    pass
+
 setup(
     name="voice-viewer",
     version="1.0.0",
@@ -33,6 +42,7 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=requirements,
+    ext_modules=ext_modules,
     entry_points={
         "console_scripts": [
             "voice-viewer=voice_viewer.cli:main",
@@ -0,0 +1,103 @@
+"""
+Tests for the audio analyzer
+"""
+
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from voice_viewer.audio import AudioAnalyzer
+from voice_viewer.config import AudioConfig
+
+
+class _FakeTensor:
+    """Just enough of torch.Tensor for the spectrum path, backed by NumPy"""
+    
+    def __init__(self, array):
+        self.array = np.asarray(array)
+    
+    def cuda(self):
+        return self
+    
+    def cpu(self):
+        return self
+    
+    def numpy(self):
+        return self.array
+    
+    def abs(self):
+        return _FakeTensor(np.abs(self.array))
+    
+    def __mul__(self, other):
+        return _FakeTensor(self.array * other.array)
+
+
+def _fake_torch():
+    """A stand-in torch module that reports CUDA as available"""
+    torch = types.ModuleType("torch")
+    torch.Tensor = _FakeTensor
+    torch.cuda = types.SimpleNamespace(is_available=lambda: True)
+    torch.from_numpy = _FakeTensor
+    torch.fft = types.SimpleNamespace(
+        rfft=lambda tensor, dim=-1: _FakeTensor(np.fft.rfft(tensor.array, axis=dim))
+    )
+    return torch
+
+
+def test_cuda_device_uses_torch_spectrum(monkeypatch):
+    monkeypatch.setitem(sys.modules, "torch", _fake_torch())
+    gpu = AudioAnalyzer(AudioConfig(device="cuda"))
+    cpu = AudioAnalyzer(AudioConfig())
+    assert gpu._torch is not None
+    
+    rng = np.random.default_rng(0)
+    audio = rng.standard_normal(gpu.sample_rate).astype(np.float32)
+    gpu_batch = gpu.analyze_stream_soa(audio, 30)
+    cpu_batch = cpu.analyze_stream_soa(audio, 30)
+    
+    np.testing.assert_allclose(gpu_batch.spectra, cpu_batch.spectra, rtol=1e-3, atol=1e-3)
+
+
+def test_cuda_device_falls_back_without_torch(monkeypatch):
+    monkeypatch.setitem(sys.modules, "torch", None)
+    analyzer = AudioAnalyzer(AudioConfig(device="cuda"))
+    assert analyzer._torch is None
+
+
+def test_stream_blocks_match_whole_file_analysis():
+    analyzer = AudioAnalyzer(AudioConfig())
+    rng = np.random.default_rng(1)
+    audio = rng.standard_normal(analyzer.sample_rate * 3 + 123).astype(np.float32)
+    
+    whole = AudioAnalyzer(AudioConfig()).analyze_stream_soa(audio, 30)
+    rows = list(analyzer.process_audio_stream(audio, 30, block_seconds=1))
+    
+    assert len(rows) == len(whole)
+    for i, row in enumerate(rows):
+        np.testing.assert_array_equal(row.spectrum, whole.spectra[i])
+        assert row.onset == whole.onsets[i]
+        assert row.timestamp == whole.timestamps[i]
+
+
+def test_unsupported_format_names_the_extension(tmp_path):
+    path = tmp_path / "voice.m4a"
+    path.write_bytes(b"\x00" * 64)
+    
+    with pytest.raises(ValueError, match=r"Unsupported audio format '\.m4a'"):
+        AudioAnalyzer(AudioConfig()).load_audio(str(path))
+
+
+def test_load_audio_reports_missing_file(tmp_path):
+    with pytest.raises(ValueError, match="Audio file not found"):
+        AudioAnalyzer(AudioConfig()).load_audio(str(tmp_path / "missing.wav"))
+
+
+def test_aliased_extension_reports_decode_failure(tmp_path):
+    path = tmp_path / "voice.opus"
+    path.write_bytes(b"\x00" * 64)
+    
+    with pytest.raises(ValueError, match="Failed to load audio file") as excinfo:
+        AudioAnalyzer(AudioConfig()).load_audio(str(path))
+    assert excinfo.value.__cause__ is not None
@@ -0,0 +1,99 @@
+"""
+Tests for the compiled kernels against their NumPy equivalents
+"""
+
+import types
+
+import numpy as np
+import pytest
+
+from voice_viewer import _kernels
+
+_NAMES = ("window_frame", "magnitude_centroid", "blend_into", "peak_abs", "smooth_decay", "circle_points")
+
+
+@pytest.fixture(params=["jit", "aot"])
+def kernels(request):
+    """The kernels as JIT-compiled from their sources, or from the AOT build when present"""
+    if request.param == "jit":
+        numba = pytest.importorskip("numba")
+        return types.SimpleNamespace(**{
+            name: numba.njit(getattr(_kernels, f"_{name}")) for name in _NAMES
+        })
+    return pytest.importorskip("voice_viewer._vv_kernels")
+
+
+def test_window_frame(kernels):
+    rng = np.random.default_rng(0)
+    frame = rng.standard_normal(2048).astype(np.float32)
+    window = np.hanning(2048).astype(np.float32)
+    out = np.empty_like(frame)
+    
+    energy = kernels.window_frame(frame, window, out)
+    
+    np.testing.assert_allclose(out, frame * window, rtol=1e-6)
+    assert energy == pytest.approx(np.sum(frame.astype(np.float64) ** 2), rel=1e-6)
+
+
+def test_magnitude_centroid(kernels):
+    rng = np.random.default_rng(1)
+    spectrum = (rng.standard_normal(1025) + 1j * rng.standard_normal(1025)).astype(np.complex64)
+    frequencies = np.linspace(0, 22050, 1025, dtype=np.float32)
+    out = np.empty(1025, dtype=np.float32)
+    
+    centroid = kernels.magnitude_centroid(spectrum, frequencies, out)
+    
+    magnitude = np.abs(spectrum)
+    np.testing.assert_allclose(out, magnitude, rtol=1e-6)
+    assert centroid == pytest.approx(np.sum(magnitude * frequencies) / np.sum(magnitude), rel=1e-5)
+    assert kernels.magnitude_centroid(np.zeros(1025, dtype=np.complex64), frequencies, out) == 0.0
+
+
+def test_blend_into(kernels):
+    rng = np.random.default_rng(2)
+    current = rng.random(513).astype(np.float32)
+    previous = rng.random(513).astype(np.float32)
+    expected = 0.3 * current + 0.7 * previous
+    
+    kernels.blend_into(current, previous, 0.3)
+    
+    np.testing.assert_allclose(current, expected, rtol=1e-6)
+
+
+def test_peak_abs(kernels):
+    rng = np.random.default_rng(3)
+    frame = rng.standard_normal(2048).astype(np.float32)
+    
+    assert kernels.peak_abs(frame) == pytest.approx(np.abs(frame).max())
+    assert kernels.peak_abs(np.zeros(16, dtype=np.float32)) == 0.0
+
+
+def test_smooth_decay(kernels):
+    rng = np.random.default_rng(4)
+    current = rng.random(128) * 1.5
+    previous = rng.random(128) * 1.5
+    out = np.empty(128)
+    
+    kernels.smooth_decay(current, previous, out, 0.7, 0.98, 0.05)
+    
+    expected = (0.7 * previous + 0.3 * current) * 0.98
+    expected[expected < 0.05] = 0.0
+    np.testing.assert_allclose(out, np.minimum(expected, 1.0), rtol=1e-12)
+
+
+def test_circle_points(kernels):
+    rng = np.random.default_rng(5)
+    magnitudes = rng.random(64)
+    freq_mapping = rng.integers(0, 64, 360).astype(np.int64)
+    angles = np.arange(360) * 2 * np.pi / 360
+    cos_base, sin_base = np.cos(angles), np.sin(angles)
+    cos_r, sin_r = np.cos(0.3), np.sin(0.3)
+    out = np.empty((360, 2), dtype=np.int32)
+    
+    kernels.circle_points(magnitudes, freq_mapping, cos_base, sin_base, cos_r, sin_r,
+                          320.0, 180.0, 50.0, 100.0, 1.2, out)
+    
+    radius = 50.0 + magnitudes[freq_mapping] * 100.0 * 1.2
+    x = 320.0 + radius * (cos_base * cos_r - sin_base * sin_r)
+    y = 180.0 + radius * (sin_base * cos_r + cos_base * sin_r)
+    np.testing.assert_array_equal(out, np.stack([x, y], axis=1).astype(np.int32))
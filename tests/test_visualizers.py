@@ -0,0 +1,127 @@
+"""
+Tests for the visualizers
+"""
+
+import warnings
+
+import numpy as np
+import pytest
+
+from voice_viewer.audio import AudioFeatures
+from voice_viewer.config import Config
+from voice_viewer.visualizers import get_visualizer
+
+
+def _config(visualizer: str, bars: int = 64) -> Config:
+    config = Config.load_theme("professional")
+    config.visualizer.type = visualizer
+    config.visualizer.bars = bars
+    config.video.resolution = (320, 180)
+    return config
+
+
+def _features(rng, timestamp: float = 0.0, n_bins: int = 513) -> AudioFeatures:
+    spectrum = (rng.random(n_bins) * 5).astype(np.float32)
+    return AudioFeatures(
+        timestamp=timestamp,
+        amplitude=0.2,
+        spectrum=spectrum,
+        frequencies=np.linspace(0, 22050, n_bins, dtype=np.float32)
+    )
+
+
+def test_spectrum_bar_count_change_restarts_smoothing():
+    rng = np.random.default_rng(0)
+    config = _config("spectrum", bars=16)
+    visualizer = get_visualizer("spectrum", config)
+    visualizer.render_frame(_features(rng))
+    
+    resized = _config("spectrum", bars=128)
+    visualizer.update_params(resized)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # NaNs from out-of-bounds reads warn on cast
+        for i in range(3):
+            frame = visualizer.render_frame(_features(rng, i / 30))
+    
+    assert frame.shape == (180, 320, 3)
+    assert visualizer.previous_heights.shape == (128,)
+    assert np.isfinite(visualizer.previous_heights).all()
+
+
+def test_smoothing_rejects_mismatched_output():
+    config = _config("spectrum")
+    visualizer = get_visualizer("spectrum", config)
+    current = np.full(8, 0.5)
+    previous = np.full(8, 0.25)
+    
+    with pytest.raises(ValueError):
+        visualizer._apply_smoothing(current, previous, out=np.empty(4))
+    
+    assert visualizer._apply_smoothing(current, np.zeros(4)) is current
+
+
+def test_normalizer_records_each_frame_token_once():
+    from voice_viewer.visualizers import SpectrumNormalizer
+    rng = np.random.default_rng(2)
+    spectrum = rng.random(513)
+    
+    normalizer = SpectrumNormalizer()
+    first = normalizer(spectrum, 1.0, frame=0.0)
+    assert normalizer(spectrum.copy(), 1.0, frame=0.0) is first
+    assert normalizer._max_history_count == 1
+    assert not first.flags.writeable
+    
+    # Untokened calls are separate frames even for the same array
+    normalizer(spectrum, 1.0)
+    normalizer(spectrum, 1.0)
+    assert normalizer._max_history_count == 3
+
+
+def test_package_import_defers_heavy_dependencies():
+    import subprocess
+    import sys
+    
+    code = (
+        "import sys, voice_viewer.visualizers as v; list(v.VISUALIZERS); "
+        "print(sorted(m for m in ('cv2', 'scipy', 'soundfile') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def _batch(seconds: float = 1.0):
+    from voice_viewer.audio import AudioAnalyzer
+    from voice_viewer.config import AudioConfig
+    
+    analyzer = AudioAnalyzer(AudioConfig())
+    rng = np.random.default_rng(3)
+    audio = (rng.standard_normal(int(analyzer.sample_rate * seconds)) * 0.3).astype(np.float32)
+    return analyzer.analyze_stream_soa(audio, 30)
+
+
+def test_normalize_batch_matches_per_frame_calls():
+    from voice_viewer.visualizers import SpectrumNormalizer
+    spectra = _batch(2.0).spectra  # Longer than the 30-frame maxima window
+    
+    expected = SpectrumNormalizer()
+    batched = SpectrumNormalizer().normalize_batch(spectra, 1.5)
+    
+    for i, spectrum in enumerate(spectra):
+        np.testing.assert_allclose(batched[i], expected(spectrum, 1.5), rtol=1e-12)
+
+
+@pytest.mark.parametrize("name", ["spectrum", "waveform", "circular"])
+def test_render_batch_matches_per_frame_rendering(name):
+    features = _batch()
+    config = _config(name)
+    
+    # Circle frequency mappings are shuffled with the global generator
+    np.random.seed(0)
+    batched = get_visualizer(name, config)
+    np.random.seed(0)
+    single = get_visualizer(name, config)
+    
+    frames = [frame.copy() for frame in batched.render_batch(features)]
+    assert len(frames) == len(features)
+    for i, frame in enumerate(frames):
+        np.testing.assert_array_equal(frame, single.render_frame(features[i]))
@@ -0,0 +1,80 @@
+"""
+Compiled numeric kernels for the per-frame analysis and rendering paths
+
+The kernels are loaded from the ahead-of-time build in ``_vv_kernels`` when
+it exists (see ``_kernels_aot.py``), so no LLVM compilation happens at run
+time. Otherwise they are JIT-compiled with Numba on first use.
+"""
+
+
+def _window_frame(frame, window, out):
+    """Multiply a frame by the analysis window into out and return the frame energy"""
+    energy = 0.0
+    for i in range(frame.shape[0]):
+        x = frame[i]
+        energy += x * x
+        out[i] = x * window[i]
+    return energy
+
+
+def _magnitude_centroid(spectrum, frequencies, out):
+    """Write |spectrum| into out and return the magnitude-weighted mean frequency"""
+    total = 0.0
+    weighted = 0.0
+    for k in range(spectrum.shape[0]):
+        magnitude = abs(spectrum[k])
+        out[k] = magnitude
+        total += magnitude
+        weighted += magnitude * frequencies[k]
+    if total > 1e-12:
+        return weighted / total
+    return 0.0
+
+
+def _blend_into(current, previous, alpha):
+    """Exponential smoothing in place: current = alpha * current + (1 - alpha) * previous"""
+    for k in range(current.shape[0]):
+        current[k] = alpha * current[k] + (1.0 - alpha) * previous[k]
+
+
+def _peak_abs(frame):
+    """Largest absolute sample value in a frame"""
+    peak = 0.0
+    for i in range(frame.shape[0]):
+        x = abs(frame[i])
+        if x > peak:
+            peak = x
+    return peak
+
+
+def _smooth_decay(current, previous, out, smoothing, decay, floor):
+    """Fused EMA, decay, noise floor and [0, 1] clamp: one read and one write per element"""
+    for i in range(current.shape[0]):
+        v = (smoothing * previous[i] + (1.0 - smoothing) * current[i]) * decay
+        if v < floor:
+            v = 0.0
+        elif v > 1.0:
+            v = 1.0
+        out[i] = v
+
+
+def _circle_points(magnitudes, freq_mapping, cos_base, sin_base, cos_r, sin_r,
+                   cx, cy, min_radius, radius_range, sensitivity, out):
+    """Fill out with the (x, y) pixel of every deformed-circle segment"""
+    for i in range(freq_mapping.shape[0]):
+        radius = min_radius + magnitudes[freq_mapping[i]] * radius_range * sensitivity
+        out[i, 0] = int(cx + radius * (cos_base[i] * cos_r - sin_base[i] * sin_r))
+        out[i, 1] = int(cy + radius * (sin_base[i] * cos_r + cos_base[i] * sin_r))
+
+
+try:
+    from ._vv_kernels import window_frame, magnitude_centroid, blend_into, peak_abs, smooth_decay, circle_points
+except ImportError:
+    from numba import njit
+
+    window_frame = njit(cache=True, fastmath=True)(_window_frame)
+    magnitude_centroid = njit(cache=True, fastmath=True)(_magnitude_centroid)
+    blend_into = njit(cache=True, fastmath=True)(_blend_into)
+    peak_abs = njit(cache=True, fastmath=True)(_peak_abs)
+    smooth_decay = njit(cache=True, fastmath=True)(_smooth_decay)
+    circle_points = njit(cache=True, fastmath=True)(_circle_points)
@@ -0,0 +1,27 @@
+"""
+Ahead-of-time build of the live analysis kernels
+
+Builds the ``voice_viewer._vv_kernels`` extension, either through setup.py or
+by running ``python -m voice_viewer._kernels_aot``. Signatures match the
+float32 analysis buffers and float64 visualizer arrays passed in at run time.
+"""
+
+import os
+
+from numba.pycc import CC
+
+from . import _kernels
+
+cc = CC('_vv_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export('window_frame', 'f8(f4[::1], f4[::1], f4[::1])')(_kernels._window_frame)
+cc.export('magnitude_centroid', 'f8(c8[::1], f4[::1], f4[::1])')(_kernels._magnitude_centroid)
+cc.export('blend_into', 'void(f4[::1], f4[::1], f8)')(_kernels._blend_into)
+cc.export('peak_abs', 'f8(f4[::1])')(_kernels._peak_abs)
+cc.export('smooth_decay', 'void(f8[::1], f8[::1], f8[::1], f8, f8, f8)')(_kernels._smooth_decay)
+cc.export('circle_points', 'void(f8[::1], i8[::1], f8[::1], f8[::1], f8, f8, f8, f8, f8, f8, f8, i4[:, ::1])')(_kernels._circle_points)
+
+
+if __name__ == "__main__":
+    cc.compile()
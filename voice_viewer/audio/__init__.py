@@ -2,6 +2,6 @@
 Audio processing module
 """
 
-from .analyzer import AudioAnalyzer, AudioFeatures
+from .analyzer import AudioAnalyzer, AudioFeatures, AudioFeaturesBatch
 
-__all__ = ["AudioAnalyzer", "AudioFeatures"]
\ No newline at end of file
+__all__ = ["AudioAnalyzer", "AudioFeatures", "AudioFeaturesBatch"]
\ No newline at end of file
@@ -2,14 +2,22 @@
 Real-time audio analysis and feature extraction
 """
 
+import math
+import os
 import numpy as np
-import librosa
-import soundfile as sf
 from typing import Tuple, Optional, Iterator
 from dataclasses import dataclass
 
 from ..config import AudioConfig
 
+# File extensions libsndfile reads under another format name
+_FORMAT_ALIASES = {
+    'AIF': 'AIFF',
+    'WAVE': 'WAV',
+    'OGA': 'OGG',
+    'OPUS': 'OGG',  # Opus streams live in an Ogg container
+}
+
 
 @dataclass
 class AudioFeatures:
@@ -23,6 +31,33 @@ class AudioFeatures:
     centroid: float = 0.0
 
 
+@dataclass
+class AudioFeaturesBatch:
+    """Column-oriented features for a whole stream, one row per video frame"""
+    timestamps: np.ndarray
+    amplitudes: np.ndarray
+    spectra: np.ndarray
+    frequencies: np.ndarray
+    onsets: np.ndarray
+    centroids: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+    
+    def __getitem__(self, index: int) -> AudioFeatures:
+        """Wrap a single row in an AudioFeatures view (the spectrum is not copied)"""
+        amplitude = float(self.amplitudes[index])
+        return AudioFeatures(
+            timestamp=float(self.timestamps[index]),
+            amplitude=amplitude,
+            spectrum=self.spectra[index],
+            frequencies=self.frequencies,
+            onset=bool(self.onsets[index]),
+            rms=amplitude,
+            centroid=float(self.centroids[index])
+        )
+
+
 class AudioAnalyzer:
     """Real-time audio analysis engine"""
     
@@ -32,77 +67,112 @@ class AudioAnalyzer:
         self.buffer_size = config.buffer_size
         self.hop_length = config.hop_length
         
-        # Pre-compute frequency bins
-        self.frequencies = librosa.fft_frequencies(
-            sr=self.sample_rate, 
-            n_fft=self.buffer_size
-        )
+        # Pre-compute analysis window and frequency bins
+        self.window = np.hanning(self.buffer_size).astype(np.float32)
+        self.frequencies = np.fft.rfftfreq(self.buffer_size, d=1.0 / self.sample_rate).astype(np.float32)
         
         # Smoothing buffer for spectrum
         self.prev_spectrum = None
         
+        # Previous frame energy for onset detection
+        self._prev_energy = 0.0
+        
+        # Scratch buffers reused by analyze_frame on every call
+        self._frame_buf = np.zeros(self.buffer_size, dtype=np.float32)
+        self._windowed_buf = np.empty(self.buffer_size, dtype=np.float32)
+        
+        # Optional GPU backend for batched spectra
+        self._torch = None
+        if config.device == "cuda":
+            self._init_gpu()
+    
+    def _init_gpu(self):
+        """Set up the CUDA spectrum backend, falling back to CPU if unavailable"""
+        try:
+            import torch
+        except ImportError:
+            print("PyTorch not installed, falling back to CPU analysis")
+            return
+        
+        if not torch.cuda.is_available():
+            print("CUDA not available, falling back to CPU analysis")
+            return
+        
+        self._torch = torch
+        self._torch_window = torch.from_numpy(self.window).cuda()
+        
     def load_audio(self, audio_path: str) -> Tuple[np.ndarray, float]:
         """Load audio file and return samples with duration"""
+        import soundfile as sf  # Deferred: soundfile loads libsndfile on import
+        
+        if not os.path.exists(audio_path):
+            raise ValueError(f"Audio file not found: {audio_path}")
+        
         try:
-            audio, sr = librosa.load(
-                audio_path, 
-                sr=self.sample_rate,
-                mono=True
-            )
-            duration = len(audio) / sr
-            return audio, duration
-        except Exception as e:
-            raise ValueError(f"Failed to load audio file: {e}")
+            audio, sr = sf.read(audio_path, dtype='float32', always_2d=False)
+        except (getattr(sf, 'LibsndfileError', RuntimeError), RuntimeError) as e:
+            # libsndfile has no AAC decoder, so name the format instead of
+            # passing on its generic error
+            extension = os.path.splitext(audio_path)[1].lstrip('.').upper()
+            if extension and _FORMAT_ALIASES.get(extension, extension) not in sf.available_formats():
+                raise ValueError(
+                    f"Unsupported audio format '.{extension.lower()}'. Supported formats include "
+                    "WAV, FLAC, OGG and MP3; convert other files (such as m4a/aac) with FFmpeg first"
+                ) from e
+            raise ValueError(f"Failed to load audio file: {e}") from e
+        
+        # Downmix to mono
+        if audio.ndim == 2:
+            audio = audio.mean(axis=1)
+        
+        # Resample only when the file rate differs from the analysis rate
+        if sr != self.sample_rate:
+            from scipy.signal import resample_poly  # Deferred: scipy.signal is slow to import
+            
+            factor = math.gcd(sr, self.sample_rate)
+            audio = resample_poly(audio, self.sample_rate // factor, sr // factor)
+        
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        duration = len(audio) / self.sample_rate
+        return audio, duration
     
     def analyze_frame(self, audio_frame: np.ndarray, timestamp: float) -> AudioFeatures:
         """Analyze a single audio frame and extract features"""
-        # Ensure frame has correct length
-        if len(audio_frame) < self.buffer_size:
-            # Pad with zeros if frame is too short
-            padded = np.zeros(self.buffer_size)
-            padded[:len(audio_frame)] = audio_frame
-            audio_frame = padded
-        elif len(audio_frame) > self.buffer_size:
-            # Truncate if frame is too long
-            audio_frame = audio_frame[:self.buffer_size]
+        # Copy into the frame buffer, truncating long frames and zero-padding short ones
+        n = min(len(audio_frame), self.buffer_size)
+        self._frame_buf[:n] = audio_frame[:n]
+        self._frame_buf[n:] = 0.0
+        audio_frame = self._frame_buf
         
         # Apply noise reduction if enabled
         if self.config.noise_reduction:
             audio_frame = self._reduce_noise(audio_frame)
         
-        # Compute amplitude (RMS)
-        rms = np.sqrt(np.mean(audio_frame**2))
-        amplitude = rms
+        # Window the frame and compute its energy in one compiled pass
+        from .. import _kernels  # Deferred: loading compiled kernels is slow
         
-        # Compute frequency spectrum using STFT
-        stft = librosa.stft(
-            audio_frame,
-            n_fft=self.buffer_size,
-            hop_length=self.hop_length
-        )
-        spectrum = np.abs(stft).mean(axis=1)  # Average across time
+        energy = _kernels.window_frame(audio_frame, self.window, self._windowed_buf)
+        rms = np.sqrt(energy / self.buffer_size)
+        
+        # Magnitude spectrum and spectral centroid in a second pass; the windowed
+        # scratch is rewritten every call, so the FFT may clobber it
+        from scipy import fft as sfft  # Deferred: scipy.fft is slow to import
+        
+        fft_frame = sfft.rfft(self._windowed_buf, workers=1, overwrite_x=True)
+        spectrum = np.empty(self.buffer_size // 2 + 1, dtype=np.float32)
+        centroid = _kernels.magnitude_centroid(fft_frame, self.frequencies, spectrum)
         
         # Apply smoothing (less aggressive for faster response)
         if self.prev_spectrum is not None:
-            spectrum = 0.5 * spectrum + 0.5 * self.prev_spectrum  # More responsive
-        self.prev_spectrum = spectrum.copy()
-        
-        # Compute spectral centroid
-        try:
-            centroid = librosa.feature.spectral_centroid(
-                y=audio_frame,
-                sr=self.sample_rate
-            )[0].mean()
-        except (AttributeError, IndexError):
-            # Fallback if spectral_centroid fails
-            centroid = 0.0
+            _kernels.blend_into(spectrum, self.prev_spectrum, 0.5)  # More responsive
+        self.prev_spectrum = spectrum  # Freshly allocated above and never written again
         
         # Simple onset detection (energy-based)
-        onset = self._detect_onset(audio_frame)
+        onset = self._detect_onset(energy)
         
         return AudioFeatures(
             timestamp=timestamp,
-            amplitude=amplitude,
+            amplitude=rms,
             spectrum=spectrum,
             frequencies=self.frequencies,
             onset=onset,
@@ -110,50 +180,152 @@ class AudioAnalyzer:
             centroid=centroid
         )
     
-    def process_audio_stream(self, audio: np.ndarray, fps: int) -> Iterator[AudioFeatures]:
-        """Process audio in chunks matching video framerate"""
+    def analyze_stream_soa(self, audio: np.ndarray, fps: int) -> AudioFeaturesBatch:
+        """Analyze a whole signal at once, one feature row per video frame"""
+        # Single precision is plenty for display and halves FFT memory traffic
+        frames = self._frame_audio(np.asarray(audio, dtype=np.float32), fps)
+        return self._analyze_frames(frames, fps)
+    
+    def _analyze_frames(self, frames: np.ndarray, fps: int, first_frame: int = 0) -> AudioFeaturesBatch:
+        """Features for already framed audio whose first row is video frame first_frame
+        
+        Onset and smoothing state carry over from the previous call, so
+        consecutive blocks give the same rows as one call over the whole stream.
+        """
+        # Apply noise reduction if enabled
+        if self.config.noise_reduction:
+            frames = self._reduce_noise(frames)
+        
+        # One batched FFT over every frame instead of one call per frame
+        spectra = self._magnitude_spectrum(frames)
+        energies = np.einsum('ij,ij->i', frames, frames)
+        amplitudes = np.sqrt(energies / self.buffer_size)
+        
+        # Energy-based onsets: compare each frame with the one before it
+        n_frames = len(frames)
+        onsets = np.zeros(n_frames, dtype=bool)
+        if n_frames > 0:
+            onsets[0] = energies[0] > self._prev_energy * 1.5
+            onsets[1:] = energies[1:] > energies[:-1] * 1.5
+            self._prev_energy = energies[-1]
+        
+        # Spectral centroids for every frame as one matrix-vector product
+        weighted = spectra @ self.frequencies
+        totals = spectra.sum(axis=1)
+        centroids = np.where(totals > 1e-12, weighted / np.maximum(totals, 1e-12), 0.0).astype(np.float32)
+        
+        if n_frames > 0:
+            spectra = self._smooth_spectra(spectra)
+            self.prev_spectrum = spectra[-1]
+        
+        return AudioFeaturesBatch(
+            timestamps=(first_frame + np.arange(n_frames)) / fps,
+            amplitudes=amplitudes,
+            spectra=spectra,
+            frequencies=self.frequencies,
+            onsets=onsets,
+            centroids=centroids
+        )
+    
+    def process_audio_stream(self, audio: np.ndarray, fps: int,
+                             block_seconds: int = 10) -> Iterator[AudioFeatures]:
+        """Process audio in chunks matching video framerate
+        
+        Analyzes block_seconds of video frames at a time, so the first frames
+        are ready without analyzing (and holding spectra for) the whole file.
+        """
+        audio = np.asarray(audio, dtype=np.float32)
+        total_frames = len(audio) // (self.sample_rate // fps)
+        block = max(1, fps * block_seconds)
+        
+        for start in range(0, total_frames, block):
+            frames = self._frame_audio(audio, fps, start, block)
+            batch = self._analyze_frames(frames, fps, start)
+            for i in range(len(batch)):
+                yield batch[i]
+    
+    def _frame_audio(self, audio: np.ndarray, fps: int, start: int = 0,
+                     count: Optional[int] = None) -> np.ndarray:
+        """Slice audio into one analysis frame per video frame, shape (n_frames, buffer_size)
+        
+        Returns frames start to start + count (default: through the end).
+        """
         samples_per_frame = self.sample_rate // fps
         total_frames = len(audio) // samples_per_frame
+        count = total_frames - start if count is None else min(count, total_frames - start)
+        count = max(count, 0)
         
-        for i in range(total_frames):
-            start_idx = i * samples_per_frame
-            end_idx = start_idx + self.buffer_size
-            
-            # Handle edge case at end of audio
-            if end_idx > len(audio):
-                frame = np.zeros(self.buffer_size)
-                remaining = len(audio) - start_idx
-                if remaining > 0:
-                    frame[:remaining] = audio[start_idx:]
-            else:
-                frame = audio[start_idx:end_idx]
-            
-            timestamp = i / fps
-            yield self.analyze_frame(frame, timestamp)
+        # Copy just the samples these frames span, zero-padding the tail so
+        # the last frames still span a full buffer
+        first = start * samples_per_frame
+        span = max(count - 1, 0) * samples_per_frame + self.buffer_size
+        segment = audio[first:first + span]
+        padded = np.zeros(span, dtype=audio.dtype)
+        padded[:len(segment)] = segment
+        
+        windows = np.lib.stride_tricks.sliding_window_view(padded, self.buffer_size)
+        return np.ascontiguousarray(windows[::samples_per_frame][:count])
+    
+    def _magnitude_spectrum(self, frames: np.ndarray) -> np.ndarray:
+        """Magnitude spectrum of one frame or a (n_frames, buffer_size) batch"""
+        if self._torch is not None and frames.ndim == 2:
+            return self._magnitude_spectrum_gpu(frames)
+        
+        from scipy import fft as sfft  # Deferred: scipy.fft is slow to import
+        
+        # The windowed product is a temporary, so the FFT may overwrite it;
+        # workers=-1 spreads the rows of a batch across all cores
+        return np.abs(sfft.rfft(frames * self.window, axis=-1, workers=-1, overwrite_x=True))
+    
+    def _magnitude_spectrum_gpu(self, frames: np.ndarray) -> np.ndarray:
+        """Batched magnitude spectrum computed on the GPU"""
+        torch = self._torch
+        batch = torch.from_numpy(np.ascontiguousarray(frames, dtype=np.float32)).cuda()
+        spectra = torch.fft.rfft(batch * self._torch_window, dim=-1).abs()
+        return spectra.cpu().numpy()
+    
+    def _smooth_spectra(self, spectra: np.ndarray) -> np.ndarray:
+        """Apply the per-frame spectrum smoothing down a whole batch at once
+        
+        The recurrence y[i] = 0.5 * x[i] + 0.5 * y[i - 1] is a first-order IIR
+        filter along the frame axis, so lfilter runs it in a single C pass.
+        """
+        from scipy.signal import lfilter  # Deferred: scipy.signal is slow to import
+        
+        alpha = 0.5
+        seed = spectra[0] if self.prev_spectrum is None else self.prev_spectrum
+        b = np.array([alpha], dtype=spectra.dtype)
+        a = np.array([1.0, alpha - 1.0], dtype=spectra.dtype)
+        zi = ((1.0 - alpha) * seed)[np.newaxis].astype(spectra.dtype)
+        smoothed, _ = lfilter(b, a, spectra, axis=0, zi=zi)
+        return smoothed
     
     def _reduce_noise(self, audio_frame: np.ndarray) -> np.ndarray:
-        """Simple noise reduction using spectral gating"""
-        # Compute noise floor (bottom 10% of spectrum energy)
-        spectrum = np.abs(np.fft.fft(audio_frame))
-        noise_floor = np.percentile(spectrum, 10)
+        """Simple noise reduction using spectral gating
         
-        # Apply spectral gate
-        threshold = noise_floor * 2.0
-        mask = spectrum > threshold
+        Works on a single frame or a (n_frames, buffer_size) batch.
+        """
+        from scipy import fft as sfft  # Deferred: scipy.fft is slow to import
+        
+        # Single real-input transform shared by the noise estimate and the gate;
+        # the negative-frequency half of a real signal is redundant
+        fft_frame = sfft.rfft(audio_frame, axis=-1, workers=-1)
+        spectrum = np.abs(fft_frame)
         
-        # Apply mask in frequency domain
-        fft_frame = np.fft.fft(audio_frame)
-        fft_frame[~mask] *= 0.1  # Reduce noise components
+        # Compute noise floor (bottom 10% of spectrum energy); a partial
+        # partition selects the k-th smallest bin without a full sort
+        k = spectrum.shape[-1] // 10
+        noise_floor = np.partition(spectrum, k, axis=-1)[..., k:k + 1]
         
-        return np.real(np.fft.ifft(fft_frame))
+        # Apply spectral gate in place
+        threshold = noise_floor * 2.0
+        np.multiply(fft_frame, 0.1, out=fft_frame, where=spectrum <= threshold)  # Reduce noise components
+        
+        return sfft.irfft(fft_frame, n=audio_frame.shape[-1], axis=-1, workers=-1, overwrite_x=True)
     
-    def _detect_onset(self, audio_frame: np.ndarray) -> bool:
+    def _detect_onset(self, energy: float) -> bool:
         """Simple energy-based onset detection"""
-        if not hasattr(self, '_prev_energy'):
-            self._prev_energy = 0.0
-        
-        current_energy = np.sum(audio_frame**2)
-        onset = current_energy > self._prev_energy * 1.5
-        self._prev_energy = current_energy
+        onset = energy > self._prev_energy * 1.5
+        self._prev_energy = energy
         
-        return onset
\ No newline at end of file
+        return onset
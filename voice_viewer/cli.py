@@ -8,8 +8,7 @@ from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from .config import Config
-from .export import VideoRenderer
-from .visualizers import VISUALIZERS
+from .visualizers import VISUALIZER_NAMES
 
 console = Console()
 
@@ -25,7 +24,7 @@ def main():
 @click.argument('audio_file', type=click.Path(exists=True, path_type=Path))
 @click.option('--output', '-o', type=click.Path(path_type=Path), 
               help='Output video file path')
-@click.option('--visualizer', '-v', type=click.Choice(list(VISUALIZERS.keys())), 
+@click.option('--visualizer', '-v', type=click.Choice(VISUALIZER_NAMES), 
               default='spectrum', help='Visualizer type')
 @click.option('--theme', '-t', type=click.Choice(['professional', 'dark', 'colorful', 'minimal']), 
               default='professional', help='Visual theme')
@@ -51,9 +50,13 @@ def main():
               help='Number of frequency bars for inner circle (circular visualizer only)')
 @click.option('--config', type=click.Path(exists=True, path_type=Path),
               help='Load configuration JSON file (overrides other parameters)')
-def generate(audio_file, output, visualizer, theme, resolution, fps, bars, rotation, inner_rotation, min_radius, max_radius, inner_min_radius, inner_max_radius, inner_bars, config):
+@click.option('--device', type=click.Choice(['cpu', 'cuda']), default='cpu',
+              help='Device for audio analysis (cuda requires PyTorch)')
+def generate(audio_file, output, visualizer, theme, resolution, fps, bars, rotation, inner_rotation, min_radius, max_radius, inner_min_radius, inner_max_radius, inner_bars, config, device):
     """Generate video visualization from audio file
     
+    AUDIO_FILE can be WAV, FLAC, OGG or MP3; convert m4a/aac with FFmpeg first.
+    
     Examples:
         # Basic usage
         python -m voice_viewer generate audio.wav
@@ -96,6 +99,7 @@ def generate(audio_file, output, visualizer, theme, resolution, fps, bars, rotat
         config_obj.visualizer.inner_bars = inner_bars
     
     config_obj.video.fps = fps
+    config_obj.audio.device = device
     
     # Set resolution
     resolutions = {
@@ -110,6 +114,8 @@ def generate(audio_file, output, visualizer, theme, resolution, fps, bars, rotat
     console.print(f"📺 Resolution: [yellow]{resolution}[/yellow] | FPS: [magenta]{fps}[/magenta]")
     
     # Render video
+    from .export import VideoRenderer
+    
     renderer = VideoRenderer(config_obj)
     
     with Progress(
@@ -131,12 +137,12 @@ def generate(audio_file, output, visualizer, theme, resolution, fps, bars, rotat
 
 @main.command()
 @click.argument('audio_file', type=click.Path(exists=True, path_type=Path))
-@click.option('--visualizer', '-v', type=click.Choice(list(VISUALIZERS.keys())), 
+@click.option('--visualizer', '-v', type=click.Choice(VISUALIZER_NAMES), 
               default='spectrum', help='Visualizer type')
 @click.option('--theme', '-t', type=click.Choice(['professional', 'dark', 'colorful', 'minimal']), 
               default='professional', help='Visual theme')
 def preview(audio_file, visualizer, theme):
-    """Preview visualization in real-time"""
+    """Preview visualization in real-time (WAV, FLAC, OGG or MP3 input)"""
     
     config = Config.load_theme(theme)
     config.visualizer.type = visualizer
@@ -145,6 +151,8 @@ def preview(audio_file, visualizer, theme):
     console.print(f"🎨 Visualizer: [green]{visualizer}[/green] | Theme: [blue]{theme}[/blue]")
     console.print("💡 Press [yellow]SPACE[/yellow] to pause/resume, [red]Q[/red] to quit")
     
+    from .export import VideoRenderer
+    
     renderer = VideoRenderer(config)
     renderer.render_video(str(audio_file), "", preview=True)
 
@@ -182,6 +190,8 @@ def themes():
 @main.command()
 def visualizers():
     """List available visualizers"""
+    from .visualizers import VISUALIZERS  # Deferred: loads every visualizer class
+    
     console.print("🎵 Available Visualizers:")
     for name, cls in VISUALIZERS.items():
         doc = cls.__doc__ or "No description"
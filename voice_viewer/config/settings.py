@@ -2,7 +2,8 @@
 Configuration models and settings for voice viewer
 """
 
-from typing import Tuple, Optional
+import functools
+from typing import Dict, Tuple, Optional
 from pydantic import BaseModel, Field
 
 
@@ -20,6 +21,7 @@ class AudioConfig(BaseModel):
     buffer_size: int = Field(default=1024, description="Buffer size for analysis")
     hop_length: int = Field(default=512, description="Hop length for FFT")
     noise_reduction: bool = Field(default=True, description="Enable noise reduction")
+    device: str = Field(default="cpu", description="Device for batched spectrum analysis (cpu or cuda)")
 
 
 class VisualizerConfig(BaseModel):
@@ -35,6 +37,7 @@ class VisualizerConfig(BaseModel):
     inner_min_radius: float = Field(default=0.05, ge=0.0, le=1.0, description="Minimum inner circle radius (0=no circle, 1=full screen)")
     inner_max_radius: float = Field(default=0.2, ge=0.0, le=1.0, description="Maximum inner circle radius (0=no circle, 1=full screen)")
     inner_bars: int = Field(default=32, ge=4, le=128, description="Number of frequency bars for inner circle")
+    aa_max_segments: int = Field(default=128, ge=0, description="Anti-alias circle edges only below this many segments (0=never)")
 
 
 class ThemeConfig(BaseModel):
@@ -46,6 +49,36 @@ class ThemeConfig(BaseModel):
     gradient: bool = Field(default=True, description="Use gradient effects")
 
 
+# Predefined themes, expressed as overrides on top of the model defaults
+_THEME_DICTS: Dict[str, dict] = {
+    # Professional theme for technical content
+    "professional": {
+        "theme": {"background": "#1a1a1a", "primary": "#00ff88", "secondary": "#ffffff", "accent": "#64ffda"},
+        "visualizer": {"smoothing": 0.9, "sensitivity": 1.0},
+    },
+    # Dark theme
+    "dark": {
+        "theme": {"background": "#0d1117", "primary": "#58a6ff", "secondary": "#f0f6fc", "accent": "#ffa657"},
+    },
+    # Colorful theme
+    "colorful": {
+        "theme": {"background": "#000000", "primary": "#ff0080", "secondary": "#00ff80", "accent": "#8000ff"},
+        "visualizer": {"sensitivity": 1.5},
+    },
+    # Minimal theme - simple white on black
+    "minimal": {
+        "theme": {"background": "#000000", "primary": "#ffffff", "secondary": "#cccccc", "accent": "#ffffff",
+                  "gradient": False},
+        "visualizer": {
+            "type": "circular",
+            "smoothing": 0.6,  # Reduced from 0.9 for faster response
+            "sensitivity": 1.0,
+            "bars": 48,
+        },
+    },
+}
+
+
 class Config(BaseModel):
     """Main configuration model"""
     video: VideoConfig = Field(default_factory=VideoConfig)
@@ -55,59 +88,15 @@ class Config(BaseModel):
     
     @classmethod
     def load_theme(cls, theme_name: str) -> "Config":
-        """Load a predefined theme"""
-        themes = {
-            "professional": cls._professional_theme(),
-            "dark": cls._dark_theme(),
-            "colorful": cls._colorful_theme(),
-            "minimal": cls._minimal_theme()
-        }
-        return themes.get(theme_name, cls())
-    
-    @classmethod
-    def _professional_theme(cls) -> "Config":
-        """Professional theme for technical content"""
-        config = cls()
-        config.theme.background = "#1a1a1a"
-        config.theme.primary = "#00ff88"
-        config.theme.secondary = "#ffffff"
-        config.theme.accent = "#64ffda"
-        config.visualizer.smoothing = 0.9
-        config.visualizer.sensitivity = 1.0
-        return config
-    
-    @classmethod
-    def _dark_theme(cls) -> "Config":
-        """Dark theme"""
-        config = cls()
-        config.theme.background = "#0d1117"
-        config.theme.primary = "#58a6ff"
-        config.theme.secondary = "#f0f6fc"
-        config.theme.accent = "#ffa657"
-        return config
-    
-    @classmethod
-    def _colorful_theme(cls) -> "Config":
-        """Colorful theme"""
-        config = cls()
-        config.theme.background = "#000000"
-        config.theme.primary = "#ff0080"
-        config.theme.secondary = "#00ff80"
-        config.theme.accent = "#8000ff"
-        config.visualizer.sensitivity = 1.5
-        return config
+        """Load a predefined theme
+        
+        Returns a fresh copy each call, so callers may modify it freely.
+        Unknown theme names fall back to the default configuration.
+        """
+        return cls._cached_theme(theme_name).model_copy(deep=True)
     
     @classmethod
-    def _minimal_theme(cls) -> "Config":
-        """Minimal theme - simple white on black"""
-        config = cls()
-        config.theme.background = "#000000"
-        config.theme.primary = "#ffffff"
-        config.theme.secondary = "#cccccc"
-        config.theme.accent = "#ffffff"
-        config.theme.gradient = False
-        config.visualizer.type = "circular"
-        config.visualizer.smoothing = 0.6  # Reduced from 0.9 for faster response
-        config.visualizer.sensitivity = 1.0
-        config.visualizer.bars = 48
-        return config
\ No newline at end of file
+    @functools.lru_cache(maxsize=8)
+    def _cached_theme(cls, theme_name: str) -> "Config":
+        """Validate each theme once and keep it as a template"""
+        return cls.model_validate(_THEME_DICTS.get(theme_name, {}))
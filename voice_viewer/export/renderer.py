@@ -6,10 +6,13 @@ import cv2
 import numpy as np
 from typing import Iterator, Optional
 from pathlib import Path
-import tempfile
-import os
+from collections import deque
+import queue
+import shutil
+import subprocess
+import threading
 
-from ..audio import AudioAnalyzer, AudioFeatures
+from ..audio import AudioAnalyzer, AudioFeatures, AudioFeaturesBatch
 from ..visualizers import get_visualizer
 from ..config import Config
 
@@ -45,48 +48,146 @@ class VideoRenderer:
     
     def _export_mode(self, audio: np.ndarray, duration: float, 
                     audio_path: str, output_path: str) -> bool:
-        """Export video to file"""
+        """Export video to file by piping raw frames straight into FFmpeg"""
         try:
-            # Create temporary video file
-            temp_dir = tempfile.mkdtemp()
-            temp_video = os.path.join(temp_dir, "temp_video.mp4")
+            cmd = self._ffmpeg_command(audio_path, output_path)
             
-            # Setup video writer
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            video_writer = cv2.VideoWriter(
-                temp_video,
-                fourcc,
-                self.fps,
-                (self.width, self.height)
-            )
-            
-            if not video_writer.isOpened():
-                raise RuntimeError("Failed to open video writer")
+            try:
+                process = subprocess.Popen(
+                    cmd,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE
+                )
+            except FileNotFoundError:
+                raise RuntimeError("FFmpeg not found. Please install FFmpeg or imageio-ffmpeg.")
             
             print(f"Rendering {duration:.1f}s video at {self.fps}fps...")
             
-            # Process audio and render frames
+            # Drain FFmpeg's stderr as it is written so a chatty encoder can
+            # never fill the pipe and stall; only the tail is kept for errors
+            stderr_tail = deque(maxlen=50)
+            stderr_thread = threading.Thread(
+                target=self._drain_stderr,
+                args=(process.stderr, stderr_tail),
+                daemon=True
+            )
+            stderr_thread.start()
+            
+            # Encode on a background thread while the next frames are rendered.
+            # Rendering itself stays sequential because visualizers carry
+            # smoothing and rotation state from frame to frame.
+            frame_queue = queue.Queue(maxsize=self.fps)
+            writer_errors = []
+            writer_thread = threading.Thread(
+                target=self._write_frames,
+                args=(process.stdin, frame_queue, writer_errors),
+                daemon=True
+            )
+            writer_thread.start()
+            
+            # Analyze the whole stream up front, then render frames
+            features_batch = self.audio_analyzer.analyze_stream_soa(audio, self.fps)
             frame_count = 0
-            for features in self.audio_analyzer.process_audio_stream(audio, self.fps):
-                frame = self.visualizer.render_frame(features)
-                video_writer.write(frame)
-                frame_count += 1
-                
-                # Progress indicator
-                if frame_count % (self.fps * 5) == 0:  # Every 5 seconds
-                    elapsed = frame_count / self.fps
-                    print(f"  Rendered {elapsed:.1f}s / {duration:.1f}s")
+            try:
+                for frame in self.render_batch(features_batch):
+                    if writer_errors:
+                        break
+                    
+                    frame_queue.put(frame)
+                    frame_count += 1
+                    
+                    # Progress indicator
+                    if frame_count % (self.fps * 5) == 0:  # Every 5 seconds
+                        elapsed = frame_count / self.fps
+                        print(f"  Rendered {elapsed:.1f}s / {duration:.1f}s")
+            finally:
+                frame_queue.put(None)
+                writer_thread.join()
+                try:
+                    process.stdin.close()
+                except BrokenPipeError:
+                    pass  # FFmpeg already exited; its return code says why
+                process.wait()
+                stderr_thread.join()
             
-            video_writer.release()
-            print(f"Video rendering complete: {frame_count} frames")
+            if process.returncode != 0:
+                stderr = b"".join(stderr_tail).decode(errors='replace').strip()
+                raise RuntimeError(f"FFmpeg error: {stderr}")
+            if writer_errors:
+                raise writer_errors[0]
             
-            # Combine video with original audio using moviepy
-            return self._combine_audio_video(temp_video, audio_path, output_path, temp_dir)
+            print(f"Video rendering complete: {frame_count} frames")
+            print(f"✅ Export complete with audio: {output_path}")
+            return True
             
         except Exception as e:
             print(f"Error in export mode: {e}")
             return False
     
+    def render_batch(self, features_batch: AudioFeaturesBatch) -> Iterator[np.ndarray]:
+        """Yield rendered frames for a whole batch of analyzed audio"""
+        return self.visualizer.render_batch(features_batch)
+    
+    def _ffmpeg_command(self, audio_path: str, output_path: str) -> list:
+        """Build the FFmpeg command that encodes raw BGR frames from stdin with the audio"""
+        codec = self.config.video.codec
+        cmd = [
+            self._find_ffmpeg(), '-y',  # -y to overwrite output file
+            '-loglevel', 'error',
+            # Raw frames from stdin
+            '-f', 'rawvideo',
+            '-pix_fmt', 'bgr24',
+            '-s', f'{self.width}x{self.height}',
+            '-r', str(self.fps),
+            '-i', '-',
+            # Original audio
+            '-i', audio_path,
+            '-c:v', codec,
+        ]
+        if codec in ('libx264', 'libx265'):
+            cmd += ['-preset', 'fast']
+        cmd += [
+            '-b:v', self.config.video.bitrate,
+            '-pix_fmt', 'yuv420p',
+            '-c:a', 'aac',     # encode audio as AAC
+            '-shortest',       # end when shortest input ends
+            output_path
+        ]
+        return cmd
+    
+    def _find_ffmpeg(self) -> str:
+        """Locate an FFmpeg binary, preferring the system one"""
+        ffmpeg = shutil.which('ffmpeg')
+        if ffmpeg:
+            return ffmpeg
+        
+        try:
+            import imageio_ffmpeg
+            return imageio_ffmpeg.get_ffmpeg_exe()
+        except (ImportError, RuntimeError):
+            return 'ffmpeg'
+    
+    def _write_frames(self, pipe, frame_queue: queue.Queue, errors: list):
+        """Write queued frames in order until a None sentinel arrives"""
+        while True:
+            frame = frame_queue.get()
+            if frame is None:
+                return
+            if errors:
+                continue  # Keep draining so the producer never blocks
+            try:
+                pipe.write(np.ascontiguousarray(frame).data)
+            except Exception as e:
+                errors.append(e)
+    
+    @staticmethod
+    def _drain_stderr(pipe, tail: deque):
+        """Read a process's stderr until it closes, keeping the last lines"""
+        with pipe:
+            for line in pipe:
+                tail.append(line)
+    
     def _preview_mode(self, audio: np.ndarray, duration: float) -> bool:
         """Preview mode with real-time display"""
         try:
@@ -95,25 +196,29 @@ class VideoRenderer:
             
             cv2.namedWindow('Voice Viewer Preview', cv2.WINDOW_AUTOSIZE)
             
+            # Overlay and timing constants shared by every frame
+            font = cv2.FONT_HERSHEY_SIMPLEX
+            text_color = (255, 255, 255)
+            frame_delay = int(1000 / self.fps)
+            
             paused = False
-            frame_idx = 0
-            features_list = list(self.audio_analyzer.process_audio_stream(audio, self.fps))
+            features_iter = self.audio_analyzer.process_audio_stream(audio, self.fps)
+            features = next(features_iter, None)
             
-            while frame_idx < len(features_list):
+            while features is not None:
                 if not paused:
-                    features = features_list[frame_idx]
                     frame = self.visualizer.render_frame(features)
                     
                     # Add timestamp overlay
-                    timestamp_text = f"Time: {features.timestamp:.2f}s"
+                    timestamp_text = f"Time: {features.timestamp:6.2f}s"
                     cv2.putText(frame, timestamp_text, (10, 30), 
-                              cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+                              font, 0.7, text_color, 2)
                     
                     cv2.imshow('Voice Viewer Preview', frame)
-                    frame_idx += 1
+                    features = next(features_iter, None)
                 
                 # Handle keyboard input
-                key = cv2.waitKey(int(1000 / self.fps)) & 0xFF
+                key = cv2.waitKey(frame_delay) & 0xFF
                 if key == ord('q'):
                     break
                 elif key == ord(' '):
@@ -126,98 +231,3 @@ class VideoRenderer:
         except Exception as e:
             print(f"Error in preview mode: {e}")
             return False
-    
-    def _combine_audio_video(self, video_path: str, audio_path: str, 
-                           output_path: str, temp_dir: str) -> bool:
-        """Combine video with original audio using FFmpeg directly"""
-        try:
-            # Try FFmpeg directly first (more reliable than MoviePy)
-            return self._combine_with_ffmpeg(video_path, audio_path, output_path, temp_dir)
-        except Exception as e:
-            print(f"❌ FFmpeg approach failed: {e}")
-            try:
-                # Fallback to MoviePy
-                return self._combine_with_moviepy(video_path, audio_path, output_path, temp_dir)
-            except Exception as e2:
-                print(f"❌ MoviePy fallback failed: {e2}")
-                # Final fallback: copy video without audio
-                import shutil
-                shutil.copy2(video_path, output_path)
-                shutil.rmtree(temp_dir)
-                print(f"⚠️  Exported video only (no audio): {output_path}")
-                return False
-    
-    def _combine_with_ffmpeg(self, video_path: str, audio_path: str, 
-                           output_path: str, temp_dir: str) -> bool:
-        """Combine audio and video using FFmpeg directly"""
-        import subprocess
-        import shutil
-        
-        print("Combining video with audio using FFmpeg...")
-        
-        # FFmpeg command to combine video and audio
-        cmd = [
-            'ffmpeg', '-y',  # -y to overwrite output file
-            '-i', video_path,  # video input
-            '-i', audio_path,  # audio input
-            '-c:v', 'copy',    # copy video stream
-            '-c:a', 'aac',     # encode audio as AAC
-            '-shortest',       # end when shortest input ends
-            output_path
-        ]
-        
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            print(f"✅ FFmpeg export complete with audio: {output_path}")
-            
-            # Cleanup
-            shutil.rmtree(temp_dir)
-            return True
-            
-        except subprocess.CalledProcessError as e:
-            print(f"FFmpeg error: {e.stderr}")
-            raise e
-        except FileNotFoundError:
-            print("FFmpeg not found. Please install FFmpeg or use MoviePy fallback.")
-            raise Exception("FFmpeg not available")
-    
-    def _combine_with_moviepy(self, video_path: str, audio_path: str, 
-                            output_path: str, temp_dir: str) -> bool:
-        """Fallback: combine using MoviePy"""
-        from moviepy.editor import VideoFileClip, AudioFileClip
-        import shutil
-        
-        print("Combining video with audio using MoviePy...")
-        
-        # Load video and audio
-        video = VideoFileClip(video_path)
-        audio = AudioFileClip(audio_path)
-        
-        print(f"Video duration: {video.duration:.2f}s")
-        print(f"Audio duration: {audio.duration:.2f}s")
-        
-        # Ensure audio duration matches video
-        if audio.duration > video.duration:
-            audio = audio.subclip(0, video.duration)
-        elif audio.duration < video.duration:
-            video = video.subclip(0, audio.duration)
-        
-        # Combine and export
-        final_video = video.set_audio(audio)
-        final_video.write_videofile(
-            output_path,
-            codec='libx264',
-            audio_codec='aac',
-            bitrate=self.config.video.bitrate,
-            verbose=False,
-            logger=None
-        )
-        
-        # Cleanup
-        video.close()
-        audio.close()
-        final_video.close()
-        shutil.rmtree(temp_dir)
-        
-        print(f"✅ MoviePy export complete with audio: {output_path}")
-        return True
\ No newline at end of file
@@ -3,10 +3,15 @@ Simple GUI live visualization with parameter controls
 """
 
 import cv2
+import faulthandler
 import numpy as np
+import os
+import signal
+import sys
 import threading
 import time
 import json
+from pathlib import Path
 from typing import Optional
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
@@ -17,39 +22,124 @@ try:
 except ImportError:
     PYAUDIO_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from .config import Config
 from .audio import AudioAnalyzer
 from .visualizers import VISUALIZERS
 
 
+def _boost_thread_priority():
+    """Best-effort real-time scheduling for the calling thread"""
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), 15)  # THREAD_PRIORITY_TIME_CRITICAL
+        else:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(10))
+    except (AttributeError, OSError):
+        pass  # Unsupported (macOS) or not permitted without rtprio/CAP_SYS_NICE
+
+
+def _pin_thread(thread: threading.Thread, slot: int):
+    """Best-effort pinning of a started thread to one CPU, keeping its caches warm"""
+    if not hasattr(os, "sched_setaffinity"):
+        return  # Linux only
+    
+    cpus = sorted(os.sched_getaffinity(0))
+    if len(cpus) <= slot:
+        return  # Not enough cores to give each thread its own
+    
+    try:
+        os.sched_setaffinity(thread.native_id, {cpus[slot]})
+    except OSError:
+        pass
+
+
+def _read_json(path: str) -> dict:
+    """Read a JSON file, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _write_json(path: str, data: dict):
+    """Write a dict as indented JSON, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        Path(path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
 class LiveVisualizerGUI:
     """Simple GUI for live microphone visualization"""
     
+    # Display format for each slider's value label, in save order
+    PARAM_FORMATS = {
+        "sensitivity": "%.2f",
+        "rotation_speed": "%.2f",
+        "inner_rotation_speed": "%.2f",
+        "min_radius": "%.2f",
+        "max_radius": "%.2f",
+        "bars": "%d",
+        "inner_min_radius": "%.2f",
+        "inner_max_radius": "%.2f",
+        "inner_bars": "%d",
+    }
+    
     def __init__(self, theme: str, save_config_path: Optional[str] = None):
         self.theme = theme
         self.save_config_path = save_config_path
         
         # Config - adjust audio settings for live mode
-        self.config = Config.load_theme(theme)
-        self.config.visualizer.type = "circular"
-        self.config.video.resolution = (640, 480)
-        # Use smaller buffer and n_fft for live mode to avoid librosa warnings
-        self.config.audio.buffer_size = 2048  # Increase buffer size
-        self.config.audio.hop_length = 512    # Keep hop length smaller than buffer
+        self.config = self._load_live_config()
         
         # Audio
         self.analyzer = AudioAnalyzer(self.config.audio)
-        self.audio_buffer = np.zeros(self.analyzer.buffer_size, dtype=np.float32)
+        self.channels = 1
+        self.audio_buffer = np.zeros((self.channels, self.analyzer.buffer_size), dtype=np.float32)
         self.mic_stream = None
         self.audio_interface = None
         
+        # Single-producer/single-consumer ring buffer: only audio_callback
+        # advances the write index, audio_loop copies the newest window out.
+        # One contiguous row per channel, the layout the FFT reads fastest
+        self._ring_size = 1 << 14  # Power of two so wraparound is a mask
+        self._ring = np.zeros((self.channels, self._ring_size), dtype=np.float32)
+        self._ring_write = 0
+        self._priority_boosted = False
+        self._last_adc_time = 0.0  # Capture time of the newest block, from PortAudio
+        
         # Visualization
         self.visualizer = None
-        self.current_frame = None
         self.is_playing = False
+        self._pending_rebuild = None
+        
+        # Ping-pong frame buffers: audio_loop renders into the back buffer and
+        # then flips _front_idx, so the display only ever reads a finished frame.
+        # The display holds _frame_lock while showing the front buffer and the
+        # flip takes it too, so a buffer is never redrawn while on screen
+        width, height = self.config.video.resolution
+        self._frames = [np.zeros((height, width, 3), dtype=np.uint8) for _ in range(2)]
+        self._front_idx = 0
+        self._has_frame = False
+        self._frame_lock = threading.Lock()
+        
+        # Placeholder shown until the first frame is rendered, drawn once
+        self._idle_frame = np.zeros((height, width, 3), dtype=np.uint8)
+        cv2.putText(self._idle_frame, "Speak into microphone", (160, 240), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
         
         # Threading
         self.stop_flag = threading.Event()
+        self._new_audio = threading.Event()
         self.audio_thread = None
         self.display_thread = None
         
@@ -57,6 +147,15 @@ class LiveVisualizerGUI:
         self.root = None
         self.create_gui()
     
+    def _load_live_config(self) -> Config:
+        """Theme config with the fixed live-mode visualizer, resolution and analysis settings"""
+        config = Config.load_theme(self.theme)
+        config.visualizer.type = "circular"
+        config.video.resolution = (640, 480)
+        config.audio.buffer_size = 2048  # Longer window for finer frequency bins
+        config.audio.hop_length = 512    # Keep hop length smaller than buffer
+        return config
+    
     def create_gui(self):
         """Create the GUI interface"""
         self.root = tk.Tk()
@@ -118,6 +217,7 @@ class LiveVisualizerGUI:
         
         # Create parameter controls
         self.param_vars = {}
+        self.param_text_vars = {}
         self.create_parameter_controls(params_frame)
         
         # Status
@@ -139,8 +239,7 @@ class LiveVisualizerGUI:
         sensitivity_scale = ttk.Scale(parent, from_=0.1, to=3.0, orient="horizontal",
                                     variable=self.param_vars["sensitivity"], command=self.update_sensitivity)
         sensitivity_scale.grid(row=row, column=1, sticky="ew", padx=5, pady=2)
-        self.sensitivity_label = ttk.Label(parent, text=f"{self.config.visualizer.sensitivity:.2f}")
-        self.sensitivity_label.grid(row=row, column=2, pady=2)
+        self._create_value_label(parent, "sensitivity", row)
         row += 1
         
         # Outer Rotation Speed
@@ -149,8 +248,7 @@ class LiveVisualizerGUI:
         rotation_scale = ttk.Scale(parent, from_=-5.0, to=5.0, orient="horizontal",
                                  variable=self.param_vars["rotation_speed"], command=self.update_rotation)
         rotation_scale.grid(row=row, column=1, sticky="ew", padx=5, pady=2)
-        self.rotation_label = ttk.Label(parent, text=f"{self.config.visualizer.rotation_speed:.2f}")
-        self.rotation_label.grid(row=row, column=2, pady=2)
+        self._create_value_label(parent, "rotation_speed", row)
         row += 1
         
         # Inner Rotation Speed
@@ -159,8 +257,7 @@ class LiveVisualizerGUI:
         inner_rotation_scale = ttk.Scale(parent, from_=-5.0, to=5.0, orient="horizontal",
                                        variable=self.param_vars["inner_rotation_speed"], command=self.update_inner_rotation)
         inner_rotation_scale.grid(row=row, column=1, sticky="ew", padx=5, pady=2)
-        self.inner_rotation_label = ttk.Label(parent, text=f"{self.config.visualizer.inner_rotation_speed:.2f}")
-        self.inner_rotation_label.grid(row=row, column=2, pady=2)
+        self._create_value_label(parent, "inner_rotation_speed", row)
         row += 1
         
         # Outer circle section
@@ -175,8 +272,7 @@ class LiveVisualizerGUI:
         min_radius_scale = ttk.Scale(parent, from_=0.0, to=1.0, orient="horizontal",
                                    variable=self.param_vars["min_radius"], command=self.update_min_radius)
         min_radius_scale.grid(row=row, column=1, sticky="ew", padx=5, pady=2)
-        self.min_radius_label = ttk.Label(parent, text=f"{self.config.visualizer.min_radius:.2f}")
-        self.min_radius_label.grid(row=row, column=2, pady=2)
+        self._create_value_label(parent, "min_radius", row)
         row += 1
         
         # Outer Max Radius
@@ -185,8 +281,7 @@ class LiveVisualizerGUI:
         max_radius_scale = ttk.Scale(parent, from_=0.0, to=1.0, orient="horizontal",
                                    variable=self.param_vars["max_radius"], command=self.update_max_radius)
         max_radius_scale.grid(row=row, column=1, sticky="ew", padx=5, pady=2)
-        self.max_radius_label = ttk.Label(parent, text=f"{self.config.visualizer.max_radius:.2f}")
-        self.max_radius_label.grid(row=row, column=2, pady=2)
+        self._create_value_label(parent, "max_radius", row)
         row += 1
         
         # Outer Bars
@@ -195,8 +290,7 @@ class LiveVisualizerGUI:
         bars_scale = ttk.Scale(parent, from_=8, to=128, orient="horizontal",
                              variable=self.param_vars["bars"], command=self.update_bars)
         bars_scale.grid(row=row, column=1, sticky="ew", padx=5, pady=2)
-        self.bars_label = ttk.Label(parent, text=str(self.config.visualizer.bars))
-        self.bars_label.grid(row=row, column=2, pady=2)
+        self._create_value_label(parent, "bars", row)
         row += 1
         
         # Inner circle section
@@ -211,8 +305,7 @@ class LiveVisualizerGUI:
         inner_min_scale = ttk.Scale(parent, from_=0.0, to=1.0, orient="horizontal",
                                   variable=self.param_vars["inner_min_radius"], command=self.update_inner_min_radius)
         inner_min_scale.grid(row=row, column=1, sticky="ew", padx=5, pady=2)
-        self.inner_min_label = ttk.Label(parent, text=f"{self.config.visualizer.inner_min_radius:.2f}")
-        self.inner_min_label.grid(row=row, column=2, pady=2)
+        self._create_value_label(parent, "inner_min_radius", row)
         row += 1
         
         # Inner Max Radius
@@ -221,8 +314,7 @@ class LiveVisualizerGUI:
         inner_max_scale = ttk.Scale(parent, from_=0.0, to=1.0, orient="horizontal",
                                   variable=self.param_vars["inner_max_radius"], command=self.update_inner_max_radius)
         inner_max_scale.grid(row=row, column=1, sticky="ew", padx=5, pady=2)
-        self.inner_max_label = ttk.Label(parent, text=f"{self.config.visualizer.inner_max_radius:.2f}")
-        self.inner_max_label.grid(row=row, column=2, pady=2)
+        self._create_value_label(parent, "inner_max_radius", row)
         row += 1
         
         # Inner Bars
@@ -231,54 +323,63 @@ class LiveVisualizerGUI:
         inner_bars_scale = ttk.Scale(parent, from_=4, to=64, orient="horizontal",
                                    variable=self.param_vars["inner_bars"], command=self.update_inner_bars)
         inner_bars_scale.grid(row=row, column=1, sticky="ew", padx=5, pady=2)
-        self.inner_bars_label = ttk.Label(parent, text=str(self.config.visualizer.inner_bars))
-        self.inner_bars_label.grid(row=row, column=2, pady=2)
+        self._create_value_label(parent, "inner_bars", row)
         
         # Configure column weights
         parent.columnconfigure(1, weight=1)
     
+    def _create_value_label(self, parent, key: str, row: int):
+        """Label showing a parameter's value, bound to a StringVar so updates skip .config()"""
+        text_var = tk.StringVar(value=self.PARAM_FORMATS[key] % getattr(self.config.visualizer, key))
+        self.param_text_vars[key] = text_var
+        ttk.Label(parent, textvariable=text_var).grid(row=row, column=2, pady=2)
+    
+    def _set_value_text(self, key: str, value):
+        """Show a new parameter value in its label"""
+        self.param_text_vars[key].set(self.PARAM_FORMATS[key] % float(value))
+    
     # Parameter update methods
     def update_sensitivity(self, value):
         self.config.visualizer.sensitivity = float(value)
-        self.sensitivity_label.config(text=f"{float(value):.2f}")
+        self._set_value_text("sensitivity", value)
     
     def update_rotation(self, value):
         self.config.visualizer.rotation_speed = float(value)
-        self.rotation_label.config(text=f"{float(value):.2f}")
+        self._set_value_text("rotation_speed", value)
     
     def update_inner_rotation(self, value):
         self.config.visualizer.inner_rotation_speed = float(value)
-        self.inner_rotation_label.config(text=f"{float(value):.2f}")
+        self._set_value_text("inner_rotation_speed", value)
     
     def update_min_radius(self, value):
         self.config.visualizer.min_radius = float(value)
-        self.min_radius_label.config(text=f"{float(value):.2f}")
-        self.recreate_visualizer()
+        self._set_value_text("min_radius", value)
+        self.apply_params()
     
     def update_max_radius(self, value):
         self.config.visualizer.max_radius = float(value)
-        self.max_radius_label.config(text=f"{float(value):.2f}")
-        self.recreate_visualizer()
+        self._set_value_text("max_radius", value)
+        self.apply_params()
     
     def update_bars(self, value):
         self.config.visualizer.bars = int(float(value))
-        self.bars_label.config(text=str(int(float(value))))
-        self.recreate_visualizer()
+        self._set_value_text("bars", value)
+        self._schedule_rebuild()
     
     def update_inner_min_radius(self, value):
         self.config.visualizer.inner_min_radius = float(value)
-        self.inner_min_label.config(text=f"{float(value):.2f}")
-        self.recreate_visualizer()
+        self._set_value_text("inner_min_radius", value)
+        self.apply_params()
     
     def update_inner_max_radius(self, value):
         self.config.visualizer.inner_max_radius = float(value)
-        self.inner_max_label.config(text=f"{float(value):.2f}")
-        self.recreate_visualizer()
+        self._set_value_text("inner_max_radius", value)
+        self.apply_params()
     
     def update_inner_bars(self, value):
         self.config.visualizer.inner_bars = int(float(value))
-        self.inner_bars_label.config(text=str(int(float(value))))
-        self.recreate_visualizer()
+        self._set_value_text("inner_bars", value)
+        self._schedule_rebuild()
     
     def toggle_playback(self):
         """Toggle microphone playback"""
@@ -303,34 +404,37 @@ class LiveVisualizerGUI:
     def start_audio(self):
         """Start audio recording and processing"""
         # Initialize microphone
+        self._ring.fill(0.0)
+        self._ring_write = 0
+        self._priority_boosted = False
+        self._last_adc_time = 0.0
+        
+        # Ask PortAudio for its lowest latency; read when PyAudio initializes
+        os.environ.setdefault("PA_MIN_LATENCY_MSEC", "5")
         self.audio_interface = pyaudio.PyAudio()
         self.mic_stream = self.audio_interface.open(
             format=pyaudio.paFloat32,
-            channels=1,
+            channels=self.channels,
             rate=self.analyzer.sample_rate,
             input=True,
-            frames_per_buffer=self.analyzer.buffer_size,
+            frames_per_buffer=self.analyzer.hop_length,  # Analysis window still comes from the ring
             stream_callback=self.audio_callback
         )
         
         # Initialize visualizer
         self.recreate_visualizer()
         
-        # Start audio thread only, display on main thread for macOS compatibility
+        # Start audio thread; the display loop is started separately by run()
         self.stop_flag.clear()
+        self._new_audio.clear()
         self.audio_thread = threading.Thread(target=self.audio_loop, daemon=True)
         self.audio_thread.start()
-        
-        # Create OpenCV window on main thread
-        try:
-            cv2.namedWindow("Voice Viewer", cv2.WINDOW_NORMAL)
-            cv2.resizeWindow("Voice Viewer", 640, 480)
-        except Exception as e:
-            print(f"OpenCV window creation error: {e}")
+        _pin_thread(self.audio_thread, 1)  # Core 0 is left to Tk and PortAudio
     
     def stop_audio(self):
         """Stop audio recording"""
         self.stop_flag.set()
+        self._new_audio.set()  # Wake audio_loop so it sees the stop flag
         
         if self.mic_stream:
             self.mic_stream.stop_stream()
@@ -343,56 +447,127 @@ class LiveVisualizerGUI:
     
     def audio_callback(self, in_data, frame_count, time_info, status):
         """Audio input callback"""
-        self.audio_buffer = np.frombuffer(in_data, dtype=np.float32).copy()
+        if not self._priority_boosted:
+            _boost_thread_priority()  # Runs on PortAudio's thread, so boost it from here
+            self._priority_boosted = True
+        
+        # np.frombuffer is a zero-copy view of PortAudio's block, which is only
+        # valid until we return; _write_ring copies it into preallocated
+        # storage, so the audio thread allocates no sample memory. The
+        # transpose is also a view that deinterleaves frames into channel rows
+        samples = np.frombuffer(in_data, dtype=np.float32, count=frame_count * self.channels)
+        self._write_ring(samples.reshape(frame_count, self.channels).T)
+        
+        # Stamp features with when the audio was captured, not when it is
+        # rendered; some host APIs report 0, so fall back to the clock
+        self._last_adc_time = time_info.get('input_buffer_adc_time') or time.monotonic()
+        self._new_audio.set()
         return (None, pyaudio.paContinue)
     
+    def _write_ring(self, samples: np.ndarray):
+        """Copy (channels, n) samples into the ring buffer, then publish the new write index"""
+        samples = samples[:, -self._ring_size:]
+        n = samples.shape[1]
+        w = self._ring_write
+        first = min(n, self._ring_size - w)
+        self._ring[:, w:w + first] = samples[:, :first]
+        self._ring[:, :n - first] = samples[:, first:]
+        self._ring_write = (w + n) & (self._ring_size - 1)
+    
+    def _read_ring(self) -> np.ndarray:
+        """Copy the newest buffer_size samples of each channel from the ring into audio_buffer"""
+        w = self._ring_write  # Snapshot the producer index once
+        n = self.audio_buffer.shape[1]
+        start = (w - n) & (self._ring_size - 1)
+        first = min(n, self._ring_size - start)
+        self.audio_buffer[:, :first] = self._ring[:, start:start + first]
+        self.audio_buffer[:, first:] = self._ring[:, :n - first]
+        return self.audio_buffer
+    
     def recreate_visualizer(self):
         """Recreate visualizer with current settings"""
         visualizer_class = VISUALIZERS.get("circular")
         if visualizer_class:
             self.visualizer = visualizer_class(self.config)
     
+    def _schedule_rebuild(self):
+        """Resize once the bar slider settles instead of on every drag tick"""
+        if self._pending_rebuild is not None:
+            self.root.after_cancel(self._pending_rebuild)
+        self._pending_rebuild = self.root.after(50, self.apply_params)
+    
+    def apply_params(self):
+        """Apply the current settings to the running visualizer in place"""
+        if self._pending_rebuild is not None:
+            self.root.after_cancel(self._pending_rebuild)
+            self._pending_rebuild = None
+        
+        if self.visualizer is None:
+            self.recreate_visualizer()
+        else:
+            self.visualizer.update_params(self.config)
+    
     def audio_loop(self):
-        """Process audio and generate frames"""
+        """Process audio and generate frames as new audio arrives"""
+        from . import _kernels  # Deferred: loading compiled kernels is slow
+        
+        min_interval = 1 / 30  # Cap rendering at 30 FPS
+        last_render = 0.0
+        
+        silence_threshold = 1e-4
+        silence_hold = 1.0  # Keep rendering this long so the visuals can decay
+        last_sound = time.perf_counter()
+        
         while not self.stop_flag.is_set():
-            if self.visualizer and len(self.audio_buffer) > 0:
+            # Wake on each audio callback instead of polling on a timer
+            if not self._new_audio.wait(timeout=0.1):
+                continue
+            self._new_audio.clear()
+            
+            # Skip this wakeup if the last frame is still fresh; the next one
+            # reads the newest samples anyway, so nothing stale is queued
+            now = time.perf_counter()
+            if now - last_render < min_interval:
+                continue
+            last_render = now
+            
+            if self.visualizer:
                 try:
-                    features = self.analyzer.analyze_frame(self.audio_buffer, time.time())
-                    self.current_frame = self.visualizer.render_frame(features)
+                    audio = self._read_ring()[0]  # Analysis is mono: first channel
+                    
+                    # Cheap peak check before the FFT: once the input has been
+                    # silent for a while the frame stops changing, so keep the last one
+                    if _kernels.peak_abs(audio) >= silence_threshold:
+                        last_sound = now
+                    elif now - last_sound > silence_hold:
+                        continue
+                    
+                    features = self.analyzer.analyze_frame(audio, self._last_adc_time)
+                    
+                    # Draw straight into the back buffer, then publish it once
+                    # the display is done with the current front buffer
+                    back = 1 - self._front_idx
+                    self.visualizer.render_frame(features, out=self._frames[back])
+                    with self._frame_lock:
+                        self._front_idx = back
+                        self._has_frame = True
                 except Exception:
                     pass
-            time.sleep(1/20)  # 20 FPS
     
     
     def reset_params(self):
         """Reset all parameters to defaults"""
-        # Reset config to theme defaults
-        self.config = Config.load_theme(self.theme)
-        self.config.visualizer.type = "circular"
-        
-        # Update GUI controls
-        self.param_vars["sensitivity"].set(self.config.visualizer.sensitivity)
-        self.param_vars["rotation_speed"].set(self.config.visualizer.rotation_speed)
-        self.param_vars["inner_rotation_speed"].set(self.config.visualizer.inner_rotation_speed)
-        self.param_vars["min_radius"].set(self.config.visualizer.min_radius)
-        self.param_vars["max_radius"].set(self.config.visualizer.max_radius)
-        self.param_vars["bars"].set(self.config.visualizer.bars)
-        self.param_vars["inner_min_radius"].set(self.config.visualizer.inner_min_radius)
-        self.param_vars["inner_max_radius"].set(self.config.visualizer.inner_max_radius)
-        self.param_vars["inner_bars"].set(self.config.visualizer.inner_bars)
-        
-        # Update labels
-        self.sensitivity_label.config(text=f"{self.config.visualizer.sensitivity:.2f}")
-        self.rotation_label.config(text=f"{self.config.visualizer.rotation_speed:.2f}")
-        self.inner_rotation_label.config(text=f"{self.config.visualizer.inner_rotation_speed:.2f}")
-        self.min_radius_label.config(text=f"{self.config.visualizer.min_radius:.2f}")
-        self.max_radius_label.config(text=f"{self.config.visualizer.max_radius:.2f}")
-        self.bars_label.config(text=str(self.config.visualizer.bars))
-        self.inner_min_label.config(text=f"{self.config.visualizer.inner_min_radius:.2f}")
-        self.inner_max_label.config(text=f"{self.config.visualizer.inner_max_radius:.2f}")
-        self.inner_bars_label.config(text=str(self.config.visualizer.inner_bars))
+        # Reset config to theme defaults, keeping the live-mode overrides the
+        # frame buffers and analyzer were sized for
+        self.config = self._load_live_config()
         
-        self.recreate_visualizer()
+        # Update GUI controls and labels
+        for key in self.PARAM_FORMATS:
+            value = getattr(self.config.visualizer, key)
+            self.param_vars[key].set(value)
+            self._set_value_text(key, value)
+        
+        self.apply_params()
     
     def load_config_dialog(self):
         """Show load config dialog"""
@@ -406,8 +581,7 @@ class LiveVisualizerGUI:
     def load_config(self, config_path: str):
         """Load configuration from JSON file"""
         try:
-            with open(config_path, 'r') as f:
-                saved_config = json.load(f)
+            saved_config = _read_json(config_path)
             
             # Apply saved visualizer settings
             visualizer_config = saved_config.get('visualizer', {})
@@ -418,44 +592,14 @@ class LiveVisualizerGUI:
                     setattr(self.config.visualizer, key, value)
             
             # Update GUI controls to reflect loaded values
-            if 'sensitivity' in visualizer_config:
-                self.param_vars["sensitivity"].set(visualizer_config['sensitivity'])
-                self.sensitivity_label.config(text=f"{visualizer_config['sensitivity']:.2f}")
+            for key in self.PARAM_FORMATS:
+                if key in visualizer_config:
+                    value = visualizer_config[key]
+                    self.param_vars[key].set(value)
+                    self._set_value_text(key, value)
             
-            if 'rotation_speed' in visualizer_config:
-                self.param_vars["rotation_speed"].set(visualizer_config['rotation_speed'])
-                self.rotation_label.config(text=f"{visualizer_config['rotation_speed']:.2f}")
-                
-            if 'inner_rotation_speed' in visualizer_config:
-                self.param_vars["inner_rotation_speed"].set(visualizer_config['inner_rotation_speed'])
-                self.inner_rotation_label.config(text=f"{visualizer_config['inner_rotation_speed']:.2f}")
-            
-            if 'min_radius' in visualizer_config:
-                self.param_vars["min_radius"].set(visualizer_config['min_radius'])
-                self.min_radius_label.config(text=f"{visualizer_config['min_radius']:.2f}")
-                
-            if 'max_radius' in visualizer_config:
-                self.param_vars["max_radius"].set(visualizer_config['max_radius'])
-                self.max_radius_label.config(text=f"{visualizer_config['max_radius']:.2f}")
-                
-            if 'bars' in visualizer_config:
-                self.param_vars["bars"].set(visualizer_config['bars'])
-                self.bars_label.config(text=str(visualizer_config['bars']))
-                
-            if 'inner_min_radius' in visualizer_config:
-                self.param_vars["inner_min_radius"].set(visualizer_config['inner_min_radius'])
-                self.inner_min_label.config(text=f"{visualizer_config['inner_min_radius']:.2f}")
-                
-            if 'inner_max_radius' in visualizer_config:
-                self.param_vars["inner_max_radius"].set(visualizer_config['inner_max_radius'])
-                self.inner_max_label.config(text=f"{visualizer_config['inner_max_radius']:.2f}")
-                
-            if 'inner_bars' in visualizer_config:
-                self.param_vars["inner_bars"].set(visualizer_config['inner_bars'])
-                self.inner_bars_label.config(text=str(visualizer_config['inner_bars']))
-            
-            # Recreate visualizer with new settings
-            self.recreate_visualizer()
+            # Apply new settings, recreating the visualizer if needed
+            self.apply_params()
             
             messagebox.showinfo("Success", f"Configuration loaded from:\n{config_path}")
             
@@ -483,21 +627,12 @@ class LiveVisualizerGUI:
                 "theme": self.theme,
                 "visualizer": {
                     "type": "circular",
-                    "sensitivity": self.config.visualizer.sensitivity,
-                    "rotation_speed": self.config.visualizer.rotation_speed,
-                    "inner_rotation_speed": self.config.visualizer.inner_rotation_speed,
-                    "min_radius": self.config.visualizer.min_radius,
-                    "max_radius": self.config.visualizer.max_radius,
-                    "bars": self.config.visualizer.bars,
-                    "inner_min_radius": self.config.visualizer.inner_min_radius,
-                    "inner_max_radius": self.config.visualizer.inner_max_radius,
-                    "inner_bars": self.config.visualizer.inner_bars,
+                    **{key: getattr(self.config.visualizer, key) for key in self.PARAM_FORMATS},
                     "smoothing": self.config.visualizer.smoothing
                 }
             }
             
-            with open(self.save_config_path, 'w') as f:
-                json.dump(config_data, f, indent=2)
+            _write_json(self.save_config_path, config_data)
             
             messagebox.showinfo("Success", f"Configuration saved to:\n{self.save_config_path}")
             
@@ -518,20 +653,62 @@ class LiveVisualizerGUI:
         
         self.root.destroy()
     
+    def _show_frame(self) -> bool:
+        """Show the front frame; returns True when ESC was pressed"""
+        with self._frame_lock:
+            frame = self._frames[self._front_idx] if self._has_frame else self._idle_frame
+            cv2.imshow("Voice Viewer", frame)
+        
+        return cv2.waitKey(1) & 0xFF == 27  # ESC
+    
+    def _create_window(self):
+        """Create the OpenCV window; HighGUI windows belong to the thread that creates them"""
+        try:
+            cv2.namedWindow("Voice Viewer", cv2.WINDOW_NORMAL)
+            cv2.resizeWindow("Voice Viewer", 640, 480)
+        except Exception as e:
+            print(f"OpenCV window creation error: {e}")
+    
+    def start_display(self):
+        """Drive the OpenCV window from its own thread where the platform allows it"""
+        if sys.platform == "darwin":
+            # Cocoa only accepts GUI calls from the main thread, so stay on Tk's loop
+            self._create_window()
+            self.update_display()
+            return
+        
+        self.display_thread = threading.Thread(target=self.display_loop, daemon=True)
+        self.display_thread.start()
+        _pin_thread(self.display_thread, 2)
+    
+    def display_loop(self):
+        """Show frames at a steady ~30 FPS without going through Tk's event loop"""
+        # Create the window here so it is created and pumped on one thread
+        self._create_window()
+        
+        interval = 1 / 30
+        next_tick = time.perf_counter()
+        
+        while not self.stop_flag.is_set():
+            try:
+                if self._show_frame():
+                    self.root.after(0, self.on_closing)  # Tk must be driven from the main thread
+                    return
+            except Exception as e:
+                print(f"Display update error: {e}")
+            
+            # Sleep until the next tick; resynchronise if a frame overran
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()
+    
     def update_display(self):
         """Update OpenCV display on main thread (macOS compatible)"""
         try:
-            if self.current_frame is not None:
-                cv2.imshow("Voice Viewer", self.current_frame)
-            else:
-                # Black frame with text
-                frame = np.zeros((480, 640, 3), dtype=np.uint8)
-                cv2.putText(frame, "Speak into microphone", (160, 240), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-                cv2.imshow("Voice Viewer", frame)
-            
-            # Check for ESC key
-            if cv2.waitKey(1) & 0xFF == 27:  # ESC
+            if self._show_frame():
                 self.on_closing()
                 return
                 
@@ -566,10 +743,15 @@ class LiveVisualizerGUI:
         except Exception:
             pass
         
+        # Dump every thread's stack on a crash, or on SIGUSR1 if a loop hangs
+        faulthandler.enable()
+        if hasattr(faulthandler, "register"):
+            faulthandler.register(signal.SIGUSR1, all_threads=True)
+        
         print("GUI window should now be visible. Look for 'Voice Viewer - Live Mode' window.")
         print("Window contents should include parameter sliders and controls.")
         
-        # Start periodic display update on main thread
-        self.update_display()
+        # Start periodic display update
+        self.start_display()
         
         self.root.mainloop()
\ No newline at end of file
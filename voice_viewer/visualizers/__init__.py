@@ -2,24 +2,68 @@
 Visualizers module
 """
 
-from .base import BaseVisualizer
-from .spectrum import SpectrumVisualizer
-from .waveform import WaveformVisualizer
-from .circular import CircularVisualizer
+import importlib
+from collections.abc import Mapping
 
-# Visualizer registry
-VISUALIZERS = {
-    "spectrum": SpectrumVisualizer,
-    "waveform": WaveformVisualizer,
-    "circular": CircularVisualizer,
+# Visualizer name -> (submodule, class name); classes are imported on first use
+_REGISTRY = {
+    "spectrum": (".spectrum", "SpectrumVisualizer"),
+    "waveform": (".waveform", "WaveformVisualizer"),
+    "circular": (".circular", "CircularVisualizer"),
 }
 
-def get_visualizer(name: str, config):
-    """Get visualizer by name"""
+# Visualizer names, available without importing any visualizer dependencies
+VISUALIZER_NAMES = tuple(_REGISTRY)
+
+# Shared building blocks, imported on first attribute access
+_SUPPORT = {
+    "BaseVisualizer": ".base",
+    "SpectrumNormalizer": ".normalizer",
+}
+
+
+class _LazyRegistry(Mapping):
+    """Read-only name -> visualizer class mapping that imports each class on first access"""
+    
+    def __init__(self, entries):
+        self._entries = entries
+        self._loaded = {}
+    
+    def __getitem__(self, name):
+        if name not in self._loaded:
+            module_name, class_name = self._entries[name]
+            module = importlib.import_module(module_name, __name__)
+            self._loaded[name] = getattr(module, class_name)
+        return self._loaded[name]
+    
+    def __iter__(self):
+        return iter(self._entries)
+    
+    def __len__(self):
+        return len(self._entries)
+
+
+# Visualizer registry
+VISUALIZERS = _LazyRegistry(_REGISTRY)
+
+_CLASS_NAMES = {class_name: name for name, (_, class_name) in _REGISTRY.items()}
+
+
+def __getattr__(attr):
+    """Import visualizer classes on first attribute access"""
+    if attr in _CLASS_NAMES:
+        return VISUALIZERS[_CLASS_NAMES[attr]]
+    if attr in _SUPPORT:
+        return getattr(importlib.import_module(_SUPPORT[attr], __name__), attr)
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
+
+
+def get_visualizer(name: str, config, normalizer=None):
+    """Get visualizer by name, optionally sharing a SpectrumNormalizer"""
     if name not in VISUALIZERS:
         available = ", ".join(VISUALIZERS.keys())
         raise ValueError(f"Unknown visualizer '{name}'. Available: {available}")
     
-    return VISUALIZERS[name](config)
+    return VISUALIZERS[name](config, normalizer)
 
-__all__ = ["BaseVisualizer", "SpectrumVisualizer", "WaveformVisualizer", "CircularVisualizer", "get_visualizer", "VISUALIZERS"]
\ No newline at end of file
+__all__ = ["BaseVisualizer", "SpectrumNormalizer", "SpectrumVisualizer", "WaveformVisualizer", "CircularVisualizer", "get_visualizer", "VISUALIZERS", "VISUALIZER_NAMES"]
\ No newline at end of file
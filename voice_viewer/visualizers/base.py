@@ -5,16 +5,17 @@ Base visualizer interface and utilities
 import numpy as np
 import cv2
 from abc import ABC, abstractmethod
-from typing import Tuple, Optional
+from typing import Iterator, Tuple, Optional
 
-from ..audio import AudioFeatures
+from ..audio import AudioFeatures, AudioFeaturesBatch
 from ..config import Config
+from .normalizer import SpectrumNormalizer
 
 
 class BaseVisualizer(ABC):
     """Abstract base class for all visualizers"""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, normalizer: Optional[SpectrumNormalizer] = None):
         self.config = config
         self.width, self.height = config.video.resolution
         self.theme = config.theme
@@ -25,22 +26,52 @@ class BaseVisualizer(ABC):
         self.primary_color = self._hex_to_bgr(self.theme.primary)
         self.secondary_color = self._hex_to_bgr(self.theme.secondary)
         self.accent_color = self._hex_to_bgr(self.theme.accent)
+        
+        # Clean background frame, copied rather than refilled on every frame
+        self._bg_template = np.full((self.height, self.width, 3), self.bg_color, dtype=np.uint8)
+        
+        # Adaptive spectrum normalization, optionally shared with other visualizers;
+        # a shared one tells frames apart by their features' timestamps
+        self._shared_normalizer = normalizer is not None
+        self.normalizer = normalizer if normalizer is not None else SpectrumNormalizer()
+    
+    def update_params(self, config: Config):
+        """Swap in settings that are read on every frame (sensitivity, rotation, smoothing)
+        
+        Settings baked in at construction, such as bar counts and radii, still
+        need a new visualizer instance unless a subclass applies them here.
+        """
+        self.config = config
+        self.viz_config = config.visualizer
     
     @abstractmethod
-    def render_frame(self, features: AudioFeatures) -> np.ndarray:
-        """Render a single frame based on audio features"""
+    def render_frame(self, features: AudioFeatures, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Render a single frame based on audio features, into out if given"""
         pass
     
+    def render_batch(self, features_batch: AudioFeaturesBatch) -> Iterator[np.ndarray]:
+        """Render every frame of a batch in order
+        
+        Visualizers override this to do stateless per-frame work for the whole
+        batch up front; the default simply renders row by row.
+        """
+        for i in range(len(features_batch)):
+            yield self.render_frame(features_batch[i])
+    
     def _hex_to_bgr(self, hex_color: str) -> Tuple[int, int, int]:
         """Convert hex color to BGR tuple for OpenCV"""
         hex_color = hex_color.lstrip('#')
         rgb = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
         return (rgb[2], rgb[1], rgb[0])  # Convert RGB to BGR
     
-    def _create_base_frame(self) -> np.ndarray:
-        """Create a base frame with background color"""
-        frame = np.full((self.height, self.width, 3), self.bg_color, dtype=np.uint8)
-        return frame
+    def _create_base_frame(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Create a base frame with background color, or clear out to it"""
+        if out is not None:
+            np.copyto(out, self._bg_template)
+            return out
+        
+        # A fresh copy, since export queues frames for the writer thread
+        return self._bg_template.copy()
     
     def _interpolate_color(self, color1: Tuple[int, int, int], 
                           color2: Tuple[int, int, int], 
@@ -53,66 +84,60 @@ class BaseVisualizer(ABC):
         )
     
     def _apply_smoothing(self, current_values: np.ndarray, 
-                        previous_values: Optional[np.ndarray]) -> np.ndarray:
-        """Apply temporal smoothing to values with decay"""
-        if previous_values is None:
+                        previous_values: Optional[np.ndarray],
+                        out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Apply temporal smoothing to values with decay
+        
+        out may be previous_values itself, since each element is read before
+        it is written. When the number of values changes (e.g. a new bar
+        count), smoothing restarts from the current values.
+        """
+        if previous_values is None or np.shape(previous_values) != np.shape(current_values):
             return current_values
         
-        smoothing = self.viz_config.smoothing
-        smoothed = smoothing * previous_values + (1 - smoothing) * current_values
-        
-        # Apply decay to prevent values from getting stuck
-        decay_factor = 0.98  # Values decay by 2% per frame
-        smoothed = smoothed * decay_factor
-        
-        # Apply floor clamping to ensure values can reach zero
-        noise_floor = 0.01
-        smoothed = np.where(smoothed < noise_floor, 0.0, smoothed)
-        
-        # Apply ceiling clamping to prevent runaway values
-        smoothed = np.clip(smoothed, 0.0, 1.0)
-        
-        return smoothed
+        from .. import _kernels  # Deferred: loading compiled kernels is slow
+        
+        # The kernel does no bounds checks, so every array must match exactly
+        current_values = np.ascontiguousarray(current_values, dtype=np.float64)
+        previous_values = np.ascontiguousarray(previous_values, dtype=np.float64)
+        if out is None:
+            out = np.empty_like(current_values)
+        elif out.shape != current_values.shape:
+            raise ValueError(f"Smoothing output has shape {out.shape}, expected {current_values.shape}")
+        
+        # Blend with the previous frame, decay by 2% per frame so values cannot
+        # get stuck, zero anything under the noise floor so they can reach zero,
+        # and clamp to [0, 1] against runaway values, all in one pass
+        _kernels.smooth_decay(current_values, previous_values, out,
+                              self.viz_config.smoothing, 0.98, 0.01)
+        return out
     
-    def _normalize_spectrum(self, spectrum: np.ndarray) -> np.ndarray:
-        """Normalize spectrum for visualization with robust clamping"""
-        # Apply logarithmic scaling
-        spectrum = np.log1p(spectrum * self.viz_config.sensitivity)
-        
-        # Use adaptive normalization with a moving maximum
-        if not hasattr(self, '_max_spectrum_history'):
-            self._max_spectrum_history = []
-        
-        current_max = spectrum.max() if spectrum.max() > 0 else 1.0
-        self._max_spectrum_history.append(current_max)
-        
-        # Keep only recent history (last 30 frames for adaptive normalization)
-        if len(self._max_spectrum_history) > 30:
-            self._max_spectrum_history.pop(0)
-        
-        # Use 95th percentile of recent maxima to avoid spikes
-        adaptive_max = np.percentile(self._max_spectrum_history, 95)
-        
-        # Normalize with adaptive maximum
-        spectrum = spectrum / max(adaptive_max, 0.1)  # Prevent division by zero
-        
-        # Hard clamp to [0, 1] range
-        spectrum = np.clip(spectrum, 0.0, 1.0)
-        
-        return spectrum
+    def _normalize_spectrum(self, spectrum: np.ndarray, timestamp: Optional[float] = None) -> np.ndarray:
+        """Normalize spectrum for visualization with robust clamping (read-only result)"""
+        return self.normalizer(spectrum, self.viz_config.sensitivity, self._frame_token(timestamp))
+    
+    def _frame_token(self, timestamp: Optional[float]):
+        """Frame identity for a shared normalizer; a private one records every call"""
+        return timestamp if self._shared_normalizer else None
+    
+    def _normalize_spectra(self, spectra: np.ndarray) -> np.ndarray:
+        """Batched _normalize_spectrum over a (n_frames, n_bins) array"""
+        return self.normalizer.normalize_batch(spectra, self.viz_config.sensitivity)
     
     def _downsample_spectrum(self, spectrum: np.ndarray, n_bars: int) -> np.ndarray:
         """Downsample spectrum to desired number of bars"""
         if len(spectrum) <= n_bars:
             return spectrum
         
-        # Group frequencies into bins
-        bin_size = len(spectrum) // n_bars
-        downsampled = np.zeros(n_bars)
-        
-        for i in range(n_bars):
-            start_idx = i * bin_size
-            end_idx = min((i + 1) * bin_size, len(spectrum))
-            downsampled[i] = np.mean(spectrum[start_idx:end_idx])
-        
-        return downsampled
\ No newline at end of file
+        # Group frequencies into equal bins (any remainder bins are dropped)
+        return self._downsample_spectra(spectrum[np.newaxis], n_bars)[0]
+    
+    def _downsample_spectra(self, spectra: np.ndarray, n_bars: int) -> np.ndarray:
+        """Batched _downsample_spectrum over a (n_frames, n_bins) array"""
+        n_frames, n_bins = spectra.shape
+        if n_bins <= n_bars:
+            return spectra
+        
+        bin_size = n_bins // n_bars
+        grouped = spectra[:, :n_bars * bin_size].reshape(n_frames, n_bars, bin_size)
+        return grouped.mean(axis=2)
\ No newline at end of file
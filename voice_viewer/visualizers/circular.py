@@ -5,56 +5,109 @@ Circular visualizer - deforming circle based on audio spectrum
 import numpy as np
 import cv2
 import math
-from typing import Optional
+from dataclasses import dataclass
+from typing import Optional, Tuple
 
 from .base import BaseVisualizer
 from ..audio import AudioFeatures
 
 
+@dataclass
+class _CircleTables:
+    """Per-bar tables for one circle, always replaced as a whole"""
+    bars: int
+    freq_mapping: np.ndarray
+    cos_base: np.ndarray
+    sin_base: np.ndarray
+    points: np.ndarray
+    freq_activity: np.ndarray
+    activity_step: np.ndarray
+
+
 class CircularVisualizer(BaseVisualizer):
     """Deforming circle visualizer - circle radius changes with frequency"""
     
-    def __init__(self, config):
-        super().__init__(config)
+    def __init__(self, config, normalizer=None):
+        super().__init__(config, normalizer)
         self.previous_spectrum = None
         
         # Circular parameters
         self.center_x = self.width // 2
         self.center_y = self.height // 2
-        # Normalized radius calculations (0.5 = half screen height)
-        screen_half_height = self.height // 2
-        self.min_radius = screen_half_height * self.viz_config.min_radius
-        self.max_radius = screen_half_height * self.viz_config.max_radius
-        self.radius_range = self.max_radius - self.min_radius
-        
-        # Inner circle parameters (same normalization)
-        self.inner_min_radius = screen_half_height * self.viz_config.inner_min_radius
-        self.inner_max_radius = screen_half_height * self.viz_config.inner_max_radius
-        self.inner_radius_range = self.inner_max_radius - self.inner_min_radius
-        
-        # Circle segments based on bars setting
-        self.circle_segments = self.viz_config.bars * 2  # 2x bars for smooth circle
-        self.angle_step = 2 * math.pi / self.circle_segments
-        
-        # Inner circle segments
-        self.inner_circle_segments = self.viz_config.inner_bars * 2
-        self.inner_angle_step = 2 * math.pi / self.inner_circle_segments
+        self.set_params(self.viz_config.min_radius, self.viz_config.max_radius,
+                        self.viz_config.inner_min_radius, self.viz_config.inner_max_radius)
         
         # Rotation tracking
         self.current_rotation = 0.0  # Current outer circle rotation in radians
         self.current_inner_rotation = 0.0  # Current inner circle rotation in radians
         
-        # Frequency mapping - distribute mid frequencies around circle
-        self.freq_mapping = self._create_frequency_mapping(self.circle_segments, self.viz_config.bars)
-        self.inner_freq_mapping = self._create_frequency_mapping(self.inner_circle_segments, self.viz_config.inner_bars)  # Different random distribution for inner circle
+        # Circle topology and per-bar state
+        self.resize(self.viz_config.bars, self.viz_config.inner_bars)
+    
+    def set_params(self, min_radius: float, max_radius: float,
+                   inner_min_radius: float, inner_max_radius: float):
+        """Set circle radii, normalized so 1.0 is half the screen height"""
+        screen_half_height = self.height // 2
+        self.min_radius = screen_half_height * min_radius
+        self.max_radius = screen_half_height * max_radius
+        self.radius_range = self.max_radius - self.min_radius
         
-        # Track frequency activity for adaptive amplification
-        self.freq_activity = np.ones(self.viz_config.bars)
-        self.inner_freq_activity = np.ones(self.viz_config.inner_bars)
+        # Inner circle parameters (same normalization)
+        self.inner_min_radius = screen_half_height * inner_min_radius
+        self.inner_max_radius = screen_half_height * inner_max_radius
+        self.inner_radius_range = self.inner_max_radius - self.inner_min_radius
+    
+    def resize(self, bars: int, inner_bars: int):
+        """Rebuild the per-bar tables for new bar counts
+        
+        Live mode resizes from the GUI thread while frames render on the audio
+        thread, so both circles' tables are built first and then published
+        with a single assignment; a frame in flight keeps the set it started
+        with.
+        """
+        outer = self._create_circle_tables(bars)
+        inner = self._create_circle_tables(inner_bars)  # Different random distribution for inner circle
+        self._tables = (outer, inner)
+        self.bars = bars
+        self.inner_bars = inner_bars
     
-    def render_frame(self, features: AudioFeatures) -> np.ndarray:
+    def _create_circle_tables(self, bars: int) -> _CircleTables:
+        """Lookup tables and buffers for a circle with the given number of bars"""
+        # Circle segments based on bars setting
+        circle_segments = bars * 2  # 2x bars for smooth circle
+        angle_step = 2 * math.pi / circle_segments
+        
+        # Cosine and sine of every unrotated segment angle; each frame only
+        # rotates these by the current angle
+        angle_base = np.arange(circle_segments) * angle_step
+        
+        return _CircleTables(
+            bars=bars,
+            # Frequency mapping - distribute mid frequencies around circle
+            freq_mapping=self._create_frequency_mapping(circle_segments, bars),
+            cos_base=np.cos(angle_base),
+            sin_base=np.sin(angle_base),
+            # Point buffer refilled every frame
+            points=np.empty((circle_segments, 2), dtype=np.int32),
+            # Track frequency activity for adaptive amplification
+            freq_activity=np.ones(bars),
+            # Scratch for each frame's contribution to the activity average
+            activity_step=np.empty(bars)
+        )
+    
+    def update_params(self, config):
+        """Apply new settings in place, keeping smoothing and rotation state"""
+        super().update_params(config)
+        self.set_params(self.viz_config.min_radius, self.viz_config.max_radius,
+                        self.viz_config.inner_min_radius, self.viz_config.inner_max_radius)
+        
+        if (self.viz_config.bars, self.viz_config.inner_bars) != (self.bars, self.inner_bars):
+            self.resize(self.viz_config.bars, self.viz_config.inner_bars)
+    
+    def render_frame(self, features: AudioFeatures, out: Optional[np.ndarray] = None) -> np.ndarray:
         """Render deforming circle frame"""
-        frame = self._create_base_frame()
+        frame = self._create_base_frame(out)
+        outer, inner = self._tables  # One consistent set for the whole frame
         
         # Update rotations for both circles
         rotation_speed_radians = math.radians(self.viz_config.rotation_speed)
@@ -64,19 +117,24 @@ class CircularVisualizer(BaseVisualizer):
         self.current_inner_rotation += inner_rotation_speed_radians
         
         # Normalize and process spectrum
-        spectrum = self._normalize_spectrum(features.spectrum)
+        spectrum = self._normalize_spectrum(features.spectrum, features.timestamp)
         
-        # Apply smoothing
-        spectrum = self._apply_smoothing(spectrum, self.previous_spectrum)
-        self.previous_spectrum = spectrum.copy()
+        # Apply smoothing in place over the previous frame's buffer, which
+        # nothing below writes to; the first frame (or a change in spectrum
+        # length) seeds it with a copy
+        if self.previous_spectrum is None or self.previous_spectrum.shape != spectrum.shape:
+            self.previous_spectrum = spectrum.astype(np.float64)
+        else:
+            spectrum = self._apply_smoothing(spectrum, self.previous_spectrum, out=self.previous_spectrum)
         
-        # Apply adaptive amplification to boost inactive frequencies
-        spectrum = self._apply_adaptive_amplification(spectrum)
-        inner_spectrum = self._apply_adaptive_amplification(spectrum, inner=True)
+        # Apply adaptive amplification to boost inactive frequencies; the inner
+        # circle tracks the already amplified outer spectrum
+        spectrum, magnitudes = self._apply_adaptive_amplification(spectrum, outer)
+        inner_magnitudes = self._amplified_bar_magnitudes(spectrum, inner)
         
         # Create deformed circle points for both circles
-        outer_circle_points = self._create_deformed_circle(spectrum, self.freq_mapping)
-        inner_circle_points = self._create_deformed_circle(inner_spectrum, self.inner_freq_mapping, inner=True)
+        outer_circle_points = self._create_deformed_circle(magnitudes, outer)
+        inner_circle_points = self._create_deformed_circle(inner_magnitudes, inner, inner=True)
         
         # Draw the outer white circle
         self._draw_deformed_circle(frame, outer_circle_points, self.primary_color)
@@ -89,7 +147,7 @@ class CircularVisualizer(BaseVisualizer):
     def _create_frequency_mapping(self, circle_segments: int, bars: int):
         """Create randomized mapping to distribute frequencies around circle"""
         # Create array of frequency indices
-        freq_indices = np.arange(bars)
+        freq_indices = np.arange(bars, dtype=np.int64)
         
         # Repeat to fill all circle segments
         repeats = (circle_segments // bars) + 1
@@ -100,16 +158,46 @@ class CircularVisualizer(BaseVisualizer):
         
         return freq_indices
     
-    def _apply_adaptive_amplification(self, spectrum: np.ndarray, inner: bool = False) -> np.ndarray:
-        """Amplify frequencies that are consistently low to increase visual feedback"""
+    def _apply_adaptive_amplification(self, spectrum: np.ndarray, tables: _CircleTables) -> Tuple[np.ndarray, np.ndarray]:
+        """Amplify frequencies that are consistently low to increase visual feedback
+        
+        Returns the amplified full spectrum and the amplified per-bar
+        magnitudes. The factors are constant within each bar's bins, so the
+        bar magnitudes are just the downsampled spectrum scaled, with no
+        second pass over the full spectrum.
+        """
         # Downsample spectrum to match frequency tracking
-        bars = self.viz_config.inner_bars if inner else self.viz_config.bars
+        bars = tables.bars
         spectrum_small = self._downsample_spectrum(spectrum, bars)
+        amplification = self._amplification_factors(spectrum_small, tables)
         
+        # Apply amplification back to full spectrum
+        amplified_spectrum = spectrum.copy()
+        if len(spectrum) > bars:
+            # Upsample amplification factors to match full spectrum by
+            # broadcasting over the same equal bins the downsample used
+            # (remainder bins past the last one are left as is)
+            bin_size = len(spectrum) // bars
+            binned = amplified_spectrum[:bars * bin_size].reshape(bars, bin_size)
+            binned *= amplification[:, np.newaxis]
+        else:
+            amplified_spectrum *= amplification[:len(spectrum)]
+        
+        return amplified_spectrum, spectrum_small * amplification[:len(spectrum_small)]
+    
+    def _amplified_bar_magnitudes(self, spectrum: np.ndarray, tables: _CircleTables) -> np.ndarray:
+        """Per-bar magnitudes with adaptive amplification, leaving the full spectrum alone"""
+        spectrum_small = self._downsample_spectrum(spectrum, tables.bars)
+        return spectrum_small * self._amplification_factors(spectrum_small, tables)[:len(spectrum_small)]
+    
+    def _amplification_factors(self, spectrum_small: np.ndarray, tables: _CircleTables) -> np.ndarray:
+        """Update a circle's activity tracking and return its per-bar amplification"""
         # Update activity tracking (exponential moving average)
         decay = 0.95
-        freq_activity = self.inner_freq_activity if inner else self.freq_activity
-        freq_activity[:] = decay * freq_activity + (1 - decay) * spectrum_small
+        freq_activity = tables.freq_activity
+        np.multiply(freq_activity, decay, out=freq_activity)
+        np.multiply(spectrum_small, 1 - decay, out=tables.activity_step)
+        np.add(freq_activity, tables.activity_step, out=freq_activity)
         
         # Calculate amplification factors (inverse of activity)
         # Low activity frequencies get higher amplification
@@ -121,71 +209,47 @@ class CircularVisualizer(BaseVisualizer):
             1.0,  # Minimum amplification (no reduction)
             max_amplification
         )
-        
-        # Apply amplification back to full spectrum
-        amplified_spectrum = spectrum.copy()
-        if len(spectrum) > bars:
-            # Upsample amplification factors to match full spectrum
-            bin_size = len(spectrum) // bars
-            for i in range(bars):
-                start_idx = i * bin_size
-                end_idx = min((i + 1) * bin_size, len(spectrum))
-                amplified_spectrum[start_idx:end_idx] *= amplification[i]
-        else:
-            amplified_spectrum *= amplification[:len(spectrum)]
-        
-        return amplified_spectrum
+        return amplification
     
-    def _create_deformed_circle(self, spectrum: np.ndarray, freq_mapping: np.ndarray, inner: bool = False) -> np.ndarray:
-        """Create circle points deformed by spectrum"""
+    def _create_deformed_circle(self, magnitudes: np.ndarray, tables: _CircleTables, inner: bool = False) -> np.ndarray:
+        """Create circle points deformed by per-bar magnitudes"""
         # Use appropriate parameters for inner vs outer circle
         if inner:
-            bars = self.viz_config.inner_bars
-            circle_segments = self.inner_circle_segments
-            angle_step = self.inner_angle_step
+            rotation = self.current_inner_rotation
             min_radius = self.inner_min_radius
             radius_range = self.inner_radius_range
         else:
-            bars = self.viz_config.bars
-            circle_segments = self.circle_segments
-            angle_step = self.angle_step
+            rotation = self.current_rotation
             min_radius = self.min_radius
             radius_range = self.radius_range
         
-        # Downsample spectrum to match our frequency mapping
-        spectrum_small = self._downsample_spectrum(spectrum, bars)
-        
-        points = []
-        for i in range(circle_segments):
-            # Apply rotation to the angle (use appropriate rotation for inner vs outer circle)
-            rotation = self.current_inner_rotation if inner else self.current_rotation
-            angle = i * angle_step + rotation
-            
-            # Get frequency index for this angle position
-            freq_idx = freq_mapping[i] if i < len(freq_mapping) else i % len(spectrum_small)
-            if freq_idx < len(spectrum_small):
-                magnitude = spectrum_small[freq_idx]
-            else:
-                magnitude = 0.0
-            
-            # Calculate radius based on magnitude
-            radius = min_radius + magnitude * radius_range * self.viz_config.sensitivity
-            
-            # Calculate point position
-            x = self.center_x + radius * math.cos(angle)
-            y = self.center_y + radius * math.sin(angle)
-            
-            points.append([int(x), int(y)])
-        
-        return np.array(points, dtype=np.int32)
+        # Bars past the end of a short spectrum stay flat
+        if len(magnitudes) < tables.bars:
+            magnitudes = np.pad(magnitudes, (0, tables.bars - len(magnitudes)))
+        
+        # Gather each segment's bar magnitude, then its radius and position,
+        # in one compiled pass; the precomputed directions are rotated with
+        # the angle-sum identities, so only two trig calls are made per frame
+        from .. import _kernels  # Deferred: loading compiled kernels is slow
+        
+        _kernels.circle_points(
+            np.ascontiguousarray(magnitudes, dtype=np.float64), tables.freq_mapping,
+            tables.cos_base, tables.sin_base, math.cos(rotation), math.sin(rotation),
+            float(self.center_x), float(self.center_y),
+            float(min_radius), float(radius_range), float(self.viz_config.sensitivity),
+            tables.points
+        )
+        return tables.points
     
     def _draw_deformed_circle(self, frame: np.ndarray, points: np.ndarray, color: tuple):
         """Draw the deformed circle using connected points"""
         if len(points) < 3:
             return
         
-        # Draw filled polygon (deformed circle)
-        cv2.fillPoly(frame, [points], color, cv2.LINE_AA)
+        # Anti-aliasing is invisible on dense polygons but still costs, so
+        # only coarse circles get it
+        line_type = cv2.LINE_AA if len(points) < self.viz_config.aa_max_segments else cv2.LINE_8
         
-        # Draw outline for definition (same color as fill)
-        cv2.polylines(frame, [points], True, color, 2, cv2.LINE_AA)
\ No newline at end of file
+        # Draw filled polygon (deformed circle); an outline in the same color
+        # would add nothing
+        cv2.fillPoly(frame, [points], color, line_type)
\ No newline at end of file
@@ -0,0 +1,135 @@
+"""
+Adaptive spectrum normalization shared between visualizers
+"""
+
+import numpy as np
+from typing import Tuple
+
+
+class SpectrumNormalizer:
+    """Log-scales spectra and normalizes them against a moving maximum
+    
+    Keeps a ring of the last 30 per-frame maxima and divides by their 95th
+    percentile. One instance can be shared by several visualizers drawing the
+    same stream: calls that pass the same frame token (such as the features'
+    timestamp) reuse that frame's result instead of recording it twice.
+    Without a token every call counts as a new frame.
+    """
+    
+    def __init__(self, history_length: int = 30):
+        # Ring buffer of recent per-frame spectrum maxima
+        self._max_history = np.zeros(history_length)
+        self._max_history_idx = 0
+        self._max_history_count = 0
+        
+        # Last frame seen, so shared callers record each frame once
+        self._last_frame = None
+        self._last_sensitivity = None
+        self._last_adaptive_max = 1.0
+        self._last_result = None
+    
+    def __call__(self, spectrum: np.ndarray, sensitivity: float, frame=None) -> np.ndarray:
+        """Normalize spectrum for visualization with robust clamping
+        
+        The result is read-only, since callers sharing a frame get the same array.
+        """
+        if self._is_last_frame(frame, sensitivity) and self._last_result is not None:
+            return self._last_result
+        
+        # Apply logarithmic scaling
+        scaled = np.log1p(spectrum * sensitivity)
+        
+        # Use adaptive normalization with a moving maximum over the last 30 frames
+        adaptive_max = self._adaptive_max(frame, sensitivity, scaled.max())
+        
+        # Normalize with adaptive maximum
+        scaled = scaled / max(adaptive_max, 0.1)  # Prevent division by zero
+        
+        # Hard clamp to [0, 1] range
+        result = np.clip(scaled, 0.0, 1.0)
+        result.flags.writeable = False
+        self._last_result = result
+        return result
+    
+    def peak(self, spectrum: np.ndarray, sensitivity: float, frame=None) -> Tuple[int, float]:
+        """Index and normalized magnitude of the loudest bin, without normalizing the rest
+        
+        Log scaling is monotonic, so the loudest raw bin is also the loudest
+        normalized one.
+        """
+        index = int(np.argmax(spectrum))
+        if self._is_last_frame(frame, sensitivity) and self._last_result is not None:
+            return index, float(self._last_result[index])
+        
+        # Scale a one-element slice so the arithmetic keeps the spectrum's dtype
+        peak = np.log1p(spectrum[index:index + 1] * sensitivity)[0]
+        adaptive_max = self._adaptive_max(frame, sensitivity, peak)
+        return index, min(max(peak / max(adaptive_max, 0.1), 0.0), 1.0)
+    
+    def normalize_batch(self, spectra: np.ndarray, sensitivity: float) -> np.ndarray:
+        """Batched __call__ over a (n_frames, n_bins) array
+        
+        Produces the same values as calling the normalizer once per row,
+        including the adaptive maximum carried over from earlier frames.
+        """
+        spectra = np.log1p(spectra * sensitivity)
+        
+        current_max = spectra.max(axis=1)
+        current_max[current_max <= 0] = 1.0
+        
+        # 95th percentile over each frame's trailing window of up to 30 maxima
+        window = len(self._max_history)
+        history = np.concatenate([self._ordered_max_history(), current_max])
+        offset = self._max_history_count
+        adaptive_max = np.empty(len(spectra))
+        for i in range(min(len(spectra), max(0, window - offset))):
+            adaptive_max[i] = np.percentile(history[:offset + i + 1], 95)
+        full = max(0, window - offset)
+        if full < len(spectra):
+            windows = np.lib.stride_tricks.sliding_window_view(history, window)
+            adaptive_max[full:] = np.percentile(windows[offset + full - (window - 1):], 95, axis=1)
+        
+        # Store the newest maxima back into the ring, oldest first
+        kept = history[-window:]
+        self._max_history[:len(kept)] = kept
+        self._max_history_count = len(kept)
+        self._max_history_idx = len(kept) % window
+        self._last_frame = None
+        
+        spectra = spectra / np.maximum(adaptive_max, 0.1)[:, np.newaxis]
+        return np.clip(spectra, 0.0, 1.0)
+    
+    def _is_last_frame(self, frame, sensitivity: float) -> bool:
+        """Whether a call belongs to the frame recorded last"""
+        return frame is not None and frame == self._last_frame and sensitivity == self._last_sensitivity
+    
+    def _adaptive_max(self, frame, sensitivity: float, current_max: float) -> float:
+        """Record one frame's log-scaled maximum and return the adaptive maximum"""
+        if self._is_last_frame(frame, sensitivity):
+            return self._last_adaptive_max
+        
+        self._max_history[self._max_history_idx] = current_max if current_max > 0 else 1.0
+        self._max_history_idx = (self._max_history_idx + 1) % len(self._max_history)
+        self._max_history_count = min(self._max_history_count + 1, len(self._max_history))
+        
+        # Use 95th percentile of recent maxima to avoid spikes
+        self._last_frame = frame
+        self._last_sensitivity = sensitivity
+        self._last_adaptive_max = self._percentile_95(self._max_history[:self._max_history_count])
+        self._last_result = None
+        return self._last_adaptive_max
+    
+    def _ordered_max_history(self) -> np.ndarray:
+        """Recent maxima from the ring buffer, oldest first"""
+        if self._max_history_count < len(self._max_history):
+            return self._max_history[:self._max_history_count]
+        return np.roll(self._max_history, -self._max_history_idx)
+    
+    @staticmethod
+    def _percentile_95(values: np.ndarray) -> float:
+        """np.percentile(values, 95) by partial selection instead of a full sort"""
+        position = 0.95 * (len(values) - 1)
+        lo = int(position)
+        hi = min(lo + 1, len(values) - 1)
+        selected = np.partition(values, [lo, hi])
+        return selected[lo] + (selected[hi] - selected[lo]) * (position - lo)
@@ -4,17 +4,17 @@ Spectrum analyzer visualizer - frequency bars
 
 import numpy as np
 import cv2
-from typing import Optional
+from typing import Iterator, Optional
 
 from .base import BaseVisualizer
-from ..audio import AudioFeatures
+from ..audio import AudioFeatures, AudioFeaturesBatch
 
 
 class SpectrumVisualizer(BaseVisualizer):
     """Frequency spectrum visualizer with bars"""
     
-    def __init__(self, config):
-        super().__init__(config)
+    def __init__(self, config, normalizer=None):
+        super().__init__(config, normalizer)
         self.previous_heights = None
         self.bar_width = self.width // self.viz_config.bars
         self.margin = self.width * 0.1  # 10% margin on each side
@@ -24,15 +24,34 @@ class SpectrumVisualizer(BaseVisualizer):
         available_width = self.width - 2 * self.margin
         total_spacing = (self.viz_config.bars - 1) * self.bar_spacing
         self.bar_width = max(1, int((available_width - total_spacing) // self.viz_config.bars))
+        
+        # Per-bar base colors; only the brightness changes from frame to frame
+        self.bar_base_colors = self._create_bar_base_colors(self.viz_config.bars)
+        
+        # Scratch tile for glow blending, sized for the largest glow box
+        self.glow_radius = 3
+        self._glow_tile = np.empty((self.height, self.bar_width + 2 * self.glow_radius + 1, 3), dtype=np.uint8)
     
-    def render_frame(self, features: AudioFeatures) -> np.ndarray:
+    def render_frame(self, features: AudioFeatures, out: Optional[np.ndarray] = None) -> np.ndarray:
         """Render spectrum bars frame"""
-        frame = self._create_base_frame()
-        
         # Normalize and downsample spectrum
-        spectrum = self._normalize_spectrum(features.spectrum)
+        spectrum = self._normalize_spectrum(features.spectrum, features.timestamp)
         spectrum = self._downsample_spectrum(spectrum, self.viz_config.bars)
         
+        return self._render_bars(spectrum, out)
+    
+    def render_batch(self, features_batch: AudioFeaturesBatch) -> Iterator[np.ndarray]:
+        """Render a batch, normalizing and downsampling every frame up front"""
+        spectra = self._normalize_spectra(features_batch.spectra)
+        spectra = self._downsample_spectra(spectra, self.viz_config.bars)
+        
+        for spectrum in spectra:
+            yield self._render_bars(spectrum)
+    
+    def _render_bars(self, spectrum: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Smooth per-bar magnitudes and draw them into a new frame (or out)"""
+        frame = self._create_base_frame(out)
+        
         # Apply smoothing
         spectrum = self._apply_smoothing(spectrum, self.previous_heights)
         self.previous_heights = spectrum.copy()
@@ -41,25 +60,34 @@ class SpectrumVisualizer(BaseVisualizer):
         max_bar_height = self.height * 0.8  # 80% of frame height
         base_y = int(self.height * 0.9)  # Start bars from bottom
         
-        # Render bars
-        for i, magnitude in enumerate(spectrum):
-            bar_height = int(magnitude * max_bar_height)
-            if bar_height < 1:
-                continue
-            
-            # Calculate bar position
-            x = int(self.margin + i * (self.bar_width + self.bar_spacing))
-            y_top = base_y - bar_height
-            y_bottom = base_y
-            
-            # Choose color based on frequency and magnitude
-            color = self._get_bar_color(i, magnitude, len(spectrum))
+        # Bar positions and heights for every bar at once
+        n_bars = len(spectrum)
+        xs = (self.margin + np.arange(n_bars) * (self.bar_width + self.bar_spacing)).astype(np.int64)
+        heights = (spectrum * max_bar_height).astype(np.int64)
+        visible = np.flatnonzero(heights >= 1).tolist()
+        
+        # Choose colors based on frequency and magnitude
+        if len(self.bar_base_colors) != n_bars:
+            self.bar_base_colors = self._create_bar_base_colors(n_bars)
+        brightness = 0.3 + 0.7 * spectrum  # Min 30%, max 100% brightness
+        colors = (self.bar_base_colors * brightness[:, np.newaxis]).astype(np.int64)
+        
+        xs, heights, colors = xs.tolist(), heights.tolist(), colors.tolist()  # Plain ints for OpenCV calls
+        y_bottom = base_y
+        
+        # Render bars, skipping those under one pixel tall
+        for i in visible:
+            magnitude = spectrum[i]
+            x = xs[i]
+            y_top = base_y - heights[i]
+            color = colors[i]
             
-            # Draw bar with gradient if enabled
+            # Draw bar with gradient if enabled; otherwise a single slice store
+            # covering the same inclusive corners as a filled cv2.rectangle
             if self.theme.gradient:
                 self._draw_gradient_bar(frame, x, y_top, y_bottom, color)
             else:
-                cv2.rectangle(frame, (x, y_top), (x + self.bar_width, y_bottom), color, -1)
+                frame[y_top:y_bottom + 1, x:x + self.bar_width + 1] = color
             
             # Add glow effect for high amplitudes
             if magnitude > 0.7:
@@ -67,21 +95,16 @@ class SpectrumVisualizer(BaseVisualizer):
         
         return frame
     
-    def _get_bar_color(self, bar_index: int, magnitude: float, total_bars: int):
-        """Get color for bar based on frequency and magnitude"""
+    def _create_bar_base_colors(self, total_bars: int) -> np.ndarray:
+        """Base color for each bar, shape (total_bars, 3)"""
         # Create color gradient from low to high frequencies
-        freq_ratio = bar_index / max(1, total_bars - 1)
-        
-        if freq_ratio < 0.33:  # Low frequencies - primary color
-            base_color = self.primary_color
-        elif freq_ratio < 0.66:  # Mid frequencies - secondary color
-            base_color = self.secondary_color
-        else:  # High frequencies - accent color
-            base_color = self.accent_color
-        
-        # Modulate brightness based on magnitude
-        brightness = 0.3 + 0.7 * magnitude  # Min 30%, max 100% brightness
-        return tuple(int(c * brightness) for c in base_color)
+        freq_ratio = np.arange(total_bars) / max(1, total_bars - 1)
+        
+        base_colors = np.empty((total_bars, 3))
+        base_colors[:] = self.accent_color  # High frequencies - accent color
+        base_colors[freq_ratio < 0.66] = self.secondary_color  # Mid frequencies - secondary color
+        base_colors[freq_ratio < 0.33] = self.primary_color  # Low frequencies - primary color
+        return base_colors
     
     def _draw_gradient_bar(self, frame: np.ndarray, x: int, y_top: int, y_bottom: int, color: tuple):
         """Draw a gradient-filled bar"""
@@ -90,29 +113,35 @@ class SpectrumVisualizer(BaseVisualizer):
             return
         
         # Create gradient from dark to full color
-        dark_color = tuple(int(c * 0.2) for c in color)
+        full = np.array(color, dtype=np.float64)
+        dark = np.array([int(c * 0.2) for c in color], dtype=np.float64)
         
-        for y in range(y_top, y_bottom):
-            # Calculate gradient factor (bottom is full color, top is dark)
-            gradient_factor = (y_bottom - y) / bar_height
-            current_color = self._interpolate_color(color, dark_color, gradient_factor)
-            
-            cv2.rectangle(frame, (x, y), (x + self.bar_width, y + 1), current_color, -1)
+        # One color per row, computed for the whole column at once (gradient
+        # factor: bottom is full color, top is dark). Rows and columns are
+        # inclusive at both ends like cv2.rectangle; the bottom edge row
+        # takes the color of the row above it
+        rows = np.arange(y_top, y_bottom + 1)
+        gradient_factor = np.maximum(y_bottom - rows, 1) / bar_height
+        column = (full + (dark - full) * gradient_factor[:, np.newaxis]).astype(np.uint8)
+        
+        # Write the whole bar with one broadcast slice assignment
+        frame[y_top:y_bottom + 1, x:x + self.bar_width + 1] = column[:, np.newaxis, :]
     
     def _add_glow_effect(self, frame: np.ndarray, x: int, y_top: int, y_bottom: int, color: tuple):
         """Add glow effect around high-magnitude bars"""
-        glow_radius = 3
         glow_color = tuple(int(c * 0.5) for c in color)
         
         # Draw glow as semi-transparent rectangles
-        for radius in range(1, glow_radius + 1):
+        for radius in range(1, self.glow_radius + 1):
             alpha = 0.3 / radius  # Fade out with distance
             glow_x1 = max(0, x - radius)
             glow_y1 = max(0, y_top - radius)
             glow_x2 = min(self.width, x + self.bar_width + radius)
             glow_y2 = min(self.height, y_bottom + radius)
             
-            # Create overlay for alpha blending
-            overlay = frame.copy()
-            cv2.rectangle(overlay, (glow_x1, glow_y1), (glow_x2, glow_y2), glow_color, -1)
-            cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0, frame)
\ No newline at end of file
+            # Blend only the glow box (corners inclusive, as cv2.rectangle
+            # fills them); the rest of the frame is left untouched
+            roi = frame[glow_y1:glow_y2 + 1, glow_x1:glow_x2 + 1]
+            tile = self._glow_tile[:roi.shape[0], :roi.shape[1]]
+            tile[:] = glow_color
+            cv2.addWeighted(tile, alpha, roi, 1 - alpha, 0, roi)
\ No newline at end of file
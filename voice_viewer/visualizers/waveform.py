@@ -4,7 +4,7 @@ Waveform visualizer - classic audio waveform display
 
 import numpy as np
 import cv2
-from typing import Optional, List
+from typing import Optional
 
 from .base import BaseVisualizer
 from ..audio import AudioFeatures
@@ -13,30 +13,35 @@ from ..audio import AudioFeatures
 class WaveformVisualizer(BaseVisualizer):
     """Classic waveform visualizer"""
     
-    def __init__(self, config):
-        super().__init__(config)
-        self.waveform_history: List[float] = []
+    def __init__(self, config, normalizer=None):
+        super().__init__(config, normalizer)
         self.history_length = self.width // 4  # Show 1/4 second of history
+        
+        # Ring buffer of recent amplitudes
+        self._hist = np.zeros(self.history_length)
+        self._hist_idx = 0
+        self._hist_filled = 0
         self.center_y = self.height // 2
         self.max_amplitude = self.height * 0.4  # Max waveform height
+        
+        # Scratch frame for the translucent frequency overlay
+        self._overlay = np.empty((self.height, self.width, 3), dtype=np.uint8)
     
-    def render_frame(self, features: AudioFeatures) -> np.ndarray:
+    def render_frame(self, features: AudioFeatures, out: Optional[np.ndarray] = None) -> np.ndarray:
         """Render waveform frame"""
-        frame = self._create_base_frame()
-        
-        # Add current amplitude to history
-        self.waveform_history.append(features.amplitude)
+        frame = self._create_base_frame(out)
         
-        # Maintain history length
-        if len(self.waveform_history) > self.history_length:
-            self.waveform_history.pop(0)
+        # Add current amplitude to history, overwriting the oldest once full
+        self._hist[self._hist_idx] = features.amplitude
+        self._hist_idx = (self._hist_idx + 1) % self.history_length
+        self._hist_filled = min(self._hist_filled + 1, self.history_length)
         
         # Draw center line
         cv2.line(frame, (0, self.center_y), (self.width, self.center_y), 
                 self.secondary_color, 1, cv2.LINE_AA)
         
         # Draw waveform
-        if len(self.waveform_history) > 1:
+        if self._hist_filled > 1:
             self._draw_waveform(frame)
         
         # Draw current amplitude indicator
@@ -48,41 +53,26 @@ class WaveformVisualizer(BaseVisualizer):
         
         return frame
     
+    def _ordered_history(self) -> np.ndarray:
+        """Recent amplitudes from the ring buffer, oldest first"""
+        if self._hist_filled < self.history_length:
+            return self._hist[:self._hist_filled]
+        return np.concatenate((self._hist[self._hist_idx:], self._hist[:self._hist_idx]))
+    
     def _draw_waveform(self, frame: np.ndarray):
         """Draw the waveform line"""
-        points = []
-        x_step = self.width / max(1, len(self.waveform_history) - 1)
+        history = self._ordered_history()
+        x_step = self.width / max(1, len(history) - 1)
         
-        for i, amplitude in enumerate(self.waveform_history):
-            x = int(i * x_step)
-            
-            # Scale amplitude to pixels
-            amplitude_scaled = amplitude * self.viz_config.sensitivity
-            y_offset = int(amplitude_scaled * self.max_amplitude)
-            
-            # Add both positive and negative points for stereo effect
-            y_pos = self.center_y - y_offset
-            y_neg = self.center_y + y_offset
-            
-            points.append((x, y_pos))
+        # Scale every amplitude to a pixel offset at once
+        xs = (np.arange(len(history)) * x_step).astype(np.int32)
+        y_offsets = (history * self.viz_config.sensitivity * self.max_amplitude).astype(np.int32)
         
-        # Draw waveform line with anti-aliasing
-        if len(points) > 1:
-            # Convert to numpy array for OpenCV
-            pts = np.array(points, dtype=np.int32)
-            
-            # Draw main waveform
-            for i in range(len(pts) - 1):
-                cv2.line(frame, tuple(pts[i]), tuple(pts[i + 1]), 
-                        self.primary_color, 2, cv2.LINE_AA)
-            
-            # Draw mirrored waveform below center
-            pts_mirror = pts.copy()
-            pts_mirror[:, 1] = 2 * self.center_y - pts_mirror[:, 1]
-            
-            for i in range(len(pts_mirror) - 1):
-                cv2.line(frame, tuple(pts_mirror[i]), tuple(pts_mirror[i + 1]), 
-                        self.primary_color, 2, cv2.LINE_AA)
+        # Main waveform above center and its mirror below, drawn as two
+        # anti-aliased polylines in one call
+        pts = np.stack((xs, self.center_y - y_offsets), axis=1)
+        pts_mirror = np.stack((xs, self.center_y + y_offsets), axis=1)
+        cv2.polylines(frame, [pts, pts_mirror], False, self.primary_color, 2, cv2.LINE_AA)
     
     def _draw_amplitude_indicator(self, frame: np.ndarray, amplitude: float):
         """Draw current amplitude level indicator"""
@@ -117,10 +107,11 @@ class WaveformVisualizer(BaseVisualizer):
         if features.spectrum is None or len(features.spectrum) == 0:
             return
         
-        # Get dominant frequency
-        spectrum = self._normalize_spectrum(features.spectrum)
-        dominant_freq_idx = np.argmax(spectrum)
-        dominant_magnitude = spectrum[dominant_freq_idx]
+        # Get dominant frequency; only its bin is normalized
+        spectrum = features.spectrum
+        dominant_freq_idx, dominant_magnitude = self.normalizer.peak(
+            spectrum, self.viz_config.sensitivity, self._frame_token(features.timestamp)
+        )
         
         if dominant_magnitude > 0.3:  # Only show if significant
             # Map frequency to color
@@ -137,12 +128,19 @@ class WaveformVisualizer(BaseVisualizer):
             circle_radius = int(dominant_magnitude * 20)
             circle_alpha = dominant_magnitude * 0.5
             
-            # Create overlay for transparency
-            overlay = frame.copy()
+            # Create overlay for transparency; only the box around the two
+            # circles changes, so only that part is copied and blended
+            x1 = max(0, self.width // 4 - circle_radius)
+            x2 = min(self.width, 3 * self.width // 4 + circle_radius + 1)
+            y1 = max(0, self.center_y - circle_radius)
+            y2 = min(self.height, self.center_y + circle_radius + 1)
+            roi = frame[y1:y2, x1:x2]
+            overlay = self._overlay
+            np.copyto(overlay[y1:y2, x1:x2], roi)
             cv2.circle(overlay, (self.width // 4, self.center_y), 
                       circle_radius, freq_color, -1)
             cv2.circle(overlay, (3 * self.width // 4, self.center_y), 
                       circle_radius, freq_color, -1)
             
-            # Blend with main frame
-            cv2.addWeighted(overlay, circle_alpha, frame, 1 - circle_alpha, 0, frame)
\ No newline at end of file
+            # Blend with main frame, writing straight back into its ROI
+            cv2.addWeighted(overlay[y1:y2, x1:x2], circle_alpha, roi, 1 - circle_alpha, 0, dst=roi)
\ No newline at end of file